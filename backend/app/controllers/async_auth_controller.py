@@ -0,0 +1,122 @@
+from datetime import datetime
+from app.models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utilis.auth import create_access_token, hash_token
+from app.utilis.password_executor import hash_password_async, check_password_async
+from app.utilis.logger import get_logger
+from app.utilis import auth_cache
+from fastapi import HTTPException
+from uuid import uuid4
+from app.models.session import Session as SessionModel
+
+logger = get_logger(__name__)
+
+class AsyncAuthController:
+    """Async version of `AuthController` (used when DATABASE_ASYNC=true)."""
+
+    @staticmethod
+    async def login(db: AsyncSession, email: str, password: str) -> dict:
+        logger.info(f"Login attempt for email: {email}")
+
+        try:
+            user = await db.scalar(select(User).where(User.email == email))
+            if not user:
+                logger.warning(f"Login failed: User not found - {email}")
+                raise HTTPException(status_code=401, detail="Invalid credentials")
+
+            if not await check_password_async(password, user.hashed_password):
+                logger.warning(f"Login failed: Invalid password - {email}")
+                raise HTTPException(status_code=422, detail=[{
+                    "loc": ["body", "password"],
+                    "msg": "email or password are incorrect",
+                    "type": "value_error",
+                }])
+
+            response = await AsyncAuthController._start_session(db, user)
+            logger.info(f"Login successful for user: {user.id} ({email})")
+            return response
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Login error for {email}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+    @staticmethod
+    async def _start_session(db: AsyncSession, user: User) -> dict:
+        """Create a session + access token for an authenticated user (login response)."""
+        access_token = create_access_token(data={"sub": str(user.id)})
+
+        session = SessionModel(
+            id=uuid4(),
+            user_id=user.id,
+            token_hash=hash_token(access_token),
+            last_used_at=datetime.utcnow()
+        )
+
+        db.add(session)
+        await db.flush()
+
+        return {
+            "access_token": access_token,
+            "type": "Bearer",
+            "user": {
+                "id": str(user.id),
+                "name": user.name,
+                "surname": user.surname,
+                "email": user.email
+            }
+        }
+
+    @staticmethod
+    async def register(db: AsyncSession, name: str, surname: str, email: str, password: str, password_confirm: str) -> dict:
+        logger.info(f"Registration attempt for email: {email}")
+
+        try:
+            # Check if user exists
+            existing_user = await db.scalar(select(User.id).where(User.email == email))
+            if existing_user:
+                logger.warning(f"Registration failed: Email already exists - {email}")
+                raise HTTPException(status_code=400, detail="Email already exists")
+
+            password_hash = await hash_password_async(password)
+            user = User(
+                id=uuid4(),
+                name=name,
+                surname=surname,
+                email=email,
+                hashed_password=password_hash,
+            )
+
+            db.add(user)
+            await db.flush()
+            await db.refresh(user)
+            logger.info(f"Registration successful for user: {user.id} ({email})")
+
+            return await AsyncAuthController._start_session(db, user)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Registration error for {email}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+    @staticmethod
+    async def logout(db: AsyncSession, user: User, session: SessionModel) -> dict:
+        """Logout user by deleting their current active session"""
+        logger.info(f"Logout attempt for user: {user.id} ({user.email})")
+
+        try:
+            auth_cache.invalidate_token(session.token_hash, db)
+            await db.delete(session)
+            await db.flush()
+            db.expunge_all()
+
+            logger.info(f"Logout successful for user: {user.id}")
+
+            return {
+                "message": "Logout successful",
+                "user_id": str(user.id)
+            }
+        except Exception as e:
+            logger.error(f"Logout error for user {user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,62 @@
+from app.utilis.password_executor import hash_password_async, check_password_async
+from app.models.user import User
+from app.utilis.logger import get_logger
+from app.utilis import auth_cache
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+logger = get_logger(__name__)
+
+class AsyncProfileController:
+    """Async version of `ProfileController` (used when DATABASE_ASYNC=true)."""
+
+    @staticmethod
+    async def update(current_user: User, name: str, surname: str, email: str, db: AsyncSession) -> object:
+        try:
+            if email != current_user.email:
+                searchEmail = await db.scalar(select(User.id).where(User.email == email))
+                if searchEmail:
+                    raise HTTPException(status_code=401, detail="Email already exists")
+
+            await db.execute(
+                update(User).where(User.id == current_user.id).values(name=name, surname=surname, email=email)
+            )
+            await db.flush()
+            auth_cache.invalidate_user(current_user.id, db)
+
+            return {
+                "message": "Profile updated successfully",
+            }
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Update profile error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to update your profile")
+
+    @staticmethod
+    async def update_password(current_user: User, old_password: str, password: str, password_confirm: str, db: AsyncSession) -> object:
+        try:
+            if not await check_password_async(old_password, current_user.hashed_password):
+                raise HTTPException(status_code=401, detail="Old password is incorrect")
+
+            # see ProfileController.update_password
+            if password.encode('utf-8')[:72] == old_password.encode('utf-8')[:72]:
+                raise HTTPException(status_code=401, detail="New password cannot be the same as the old password")
+
+            newPasswordHash = await hash_password_async(password)
+            await db.execute(
+                update(User).where(User.id == current_user.id).values(hashed_password=newPasswordHash)
+            )
+            await db.flush()
+            auth_cache.invalidate_user(current_user.id, db)
+
+            return {
+                "message": "Password updated successfully",
+            }
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Update password error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to update your password")
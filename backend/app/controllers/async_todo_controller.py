@@ -0,0 +1,382 @@
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.utilis.logger import get_logger
+from typing import List, Optional
+from app.models.todo import Todo
+import uuid
+from datetime import datetime
+from app.utilis.paginator import paginate_async, paginate_keyset_async, decode_cursor
+from app.controllers.todo_controller import (
+    _todo_statement,
+    _title_taken_statement,
+    _store_statement,
+    _stored_payload,
+    _bulk_store_statement,
+    _bulk_store_results,
+    _filter_criteria,
+    _bulk_criteria,
+    _bulk_update_statement,
+    _LIST_COLUMNS,
+    _list_cursor,
+    _list_items,
+)
+from app.utilis.todo_order import (
+    tail_statement,
+    position_statement,
+    positions_statement,
+    neighbours_statement,
+    rebalance_statement,
+    key_for_index,
+)
+from datetime import timezone
+
+
+logger = get_logger(__name__)
+
+class AsyncTodoController:
+    """Async version of `TodoController` (used when DATABASE_ASYNC=true)."""
+
+    @staticmethod
+    async def index(
+            current_user: User,
+            db: AsyncSession,
+            page: Optional[int],
+            page_size: Optional[int],
+            search: Optional[str],
+            completed: Optional[bool],
+            due_date: Optional[str],
+            priority: Optional[str],
+            cursor: Optional[str] = None) -> dict:
+        try:
+            # search, completed, due date and priority filters (only those provided)
+            criteria, rank = _filter_criteria(db, search, completed, due_date, priority)
+            todos = select(*_LIST_COLUMNS).where(Todo.user_id == current_user.id, *criteria)
+
+            # sane defaults and max limit for page size
+            if not page_size:
+                page_size = 20
+            elif page_size > 50:
+                page_size = 50
+
+            # unfiltered pages are a contiguous slice of the list: positions follow from where the page starts
+            filtered = bool(search) or completed is not None or bool(due_date) or bool(priority)
+
+            # keyset mode: seek past the (sort_key, id) of the cursor, cost independent of depth
+            if cursor:
+                sort_key, todo_id, *after = decode_cursor(cursor)
+                items_on_page, next_cursor = await paginate_keyset_async(
+                    db, todos, [Todo.sort_key, Todo.id], [int(sort_key), uuid.UUID(todo_id)], page_size
+                )
+                if filtered or not after:
+                    positions = await AsyncTodoController._positions(db, current_user, items_on_page)
+                else:
+                    # the cursor carries the position of the row it seeks past
+                    positions = {t.id: int(after[0]) + 1 + i for i, t in enumerate(items_on_page)}
+                if next_cursor:
+                    next_cursor = _list_cursor(items_on_page[-1], None if filtered else positions)
+                return {
+                    "items": _list_items(items_on_page, positions),
+                    "page_size": page_size,
+                    "next_cursor": next_cursor,
+                }
+
+            # order todos by their sort key (lowest = top), id breaks ties;
+            # searches list the best matches first
+            if rank is not None:
+                todos = todos.order_by(rank.desc(), Todo.sort_key.asc(), Todo.id.asc())
+            else:
+                todos = todos.order_by(Todo.sort_key.asc(), Todo.id.asc())
+
+            items_on_page, paginator = await paginate_async(db, todos, page or 1, page_size)
+
+            if filtered:
+                positions = await AsyncTodoController._positions(db, current_user, items_on_page)
+            else:
+                first = (paginator.page - 1) * paginator.page_size + 1
+                positions = {t.id: first + i for i, t in enumerate(items_on_page)}
+
+            # cursor to continue in keyset mode from this page (only valid for (sort_key, id) ordering)
+            next_cursor = None
+            if paginator.has_next and items_on_page and rank is None:
+                next_cursor = _list_cursor(items_on_page[-1], None if filtered else positions)
+
+            return {
+                "items": _list_items(items_on_page, positions),
+                "page": paginator.page,
+                "page_size": paginator.page_size,
+                "total": paginator.total_items,
+                "next_cursor": next_cursor,
+            }
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Index todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to get your todos")
+
+
+    @staticmethod
+    async def today(current_user: User, db: AsyncSession, priority: Optional[str] = None) -> dict:
+        try:
+            now_utc = datetime.now(timezone.utc)
+            start_of_day = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+            end_of_day = start_of_day.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+            todos = select(*_LIST_COLUMNS).where(
+                Todo.user_id == current_user.id,
+                Todo.is_completed == False,  # noqa: E712
+                Todo.due_date >= start_of_day,
+                Todo.due_date <= end_of_day,
+            )
+
+            if priority:
+                todos = todos.where(Todo.priority == priority)
+
+            todos = todos.order_by(Todo.sort_key.asc(), Todo.id.asc())
+
+            page_size = 50
+            items_on_page, paginator = await paginate_async(db, todos, 1, page_size)
+            positions = await AsyncTodoController._positions(db, current_user, items_on_page)
+
+            return {
+                "items": _list_items(items_on_page, positions),
+                "page": paginator.page,
+                "page_size": paginator.page_size,
+                "total": paginator.total_items,
+            }
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Today todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to get your today todos")
+
+
+    @staticmethod
+    async def store(current_user: User, db: AsyncSession, title: str, description: str, priority: str, due_date: datetime) -> dict:
+        try:
+            #append after the highest key; a taken title inserts nothing
+            stored = (await db.execute(_store_statement(
+                current_user.id,
+                title=title,
+                description=description,
+                priority=priority,
+                due_date=due_date,
+            ))).first()
+            if stored is None:
+                raise HTTPException(status_code=409, detail="Title already exists")
+
+            return {
+                "message": "Todo stored successfully",
+                "todo": _stored_payload(stored),
+            }
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Store todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to store your todo")
+
+
+    @staticmethod
+    async def bulk_store(current_user: User, db: AsyncSession, items: List[dict]) -> dict:
+        try:
+            #first item of each title; later copies are reported as taken
+            unique = {}
+            for item in items:
+                unique.setdefault(item["title"], item)
+
+            #one multi-row INSERT, taken titles are skipped by the unique index
+            created = (await db.execute(_bulk_store_statement(current_user.id, list(unique.values())))).all()
+
+            return _bulk_store_results(items, created)
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Bulk store todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to store your todos")
+
+
+    @staticmethod
+    async def bulk_update(
+            current_user: User,
+            db: AsyncSession,
+            operation: str,
+            ids: Optional[List[uuid.UUID]],
+            filters: Optional[dict],
+            priority: Optional[str] = None) -> dict:
+        try:
+            #one UPDATE/DELETE over every selected todo of the user
+            criteria = _bulk_criteria(db, ids, filters)
+            result = await db.execute(_bulk_update_statement(current_user.id, operation, criteria, priority))
+
+            return {
+                "message": "Todos updated successfully",
+                "operation": operation,
+                "affected": result.rowcount,
+            }
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Bulk update todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to update your todos")
+
+
+    @staticmethod
+    async def update(current_user: User, db: AsyncSession, id: uuid.UUID, title: str, description: str, priority: str, due_date: datetime) -> dict:
+        try:
+            # get todo
+            todo = await AsyncTodoController._find(db, current_user, id)
+
+            # check if title already exists
+            if title != todo.title:
+                chekSameTitleTodo = await db.scalar(_title_taken_statement(current_user.id, title))
+                if chekSameTitleTodo:
+                    raise HTTPException(status_code=409, detail="Title already exists")
+
+            # check if due date is not empty and is not the past if user changed the value
+            if due_date is not None and todo.due_date is not None and due_date <= todo.due_date:
+                if due_date <= datetime.now(timezone.utc):
+                   raise HTTPException(status_code=422, detail="Due date must be in the future")
+
+            #update todo
+            todo.title = title
+            todo.description = description
+            todo.priority = priority
+            todo.due_date = due_date
+            try:
+                await db.flush()
+            except IntegrityError:
+                # another request took the title since the check above
+                raise HTTPException(status_code=409, detail="Title already exists")
+            todo.order = await db.scalar(position_statement(todo))
+
+            return {
+                "message": "Todo completed updated successfully",
+                "todo": AsyncTodoController._todo_payload(todo),
+            }
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Update todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to update your todo")
+
+
+    @staticmethod
+    async def update_order(current_user: User, db: AsyncSession, id: uuid.UUID, order: int) -> dict:
+        try:
+            todo_to_move = await AsyncTodoController._find(db, current_user, id)
+
+            # interpret `order` as the desired 1-based position in the list
+            index = max(order, 1) - 1
+
+            # only the todo moves: its new key goes between its new neighbours
+            sort_key, position = await AsyncTodoController._key_for_position(db, current_user, todo_to_move, index)
+            if sort_key is None:
+                # no gap left between the neighbours, respace the list once and retry
+                await db.execute(rebalance_statement(current_user.id))
+                await db.refresh(todo_to_move)
+                sort_key, position = await AsyncTodoController._key_for_position(db, current_user, todo_to_move, index)
+
+            if sort_key != todo_to_move.sort_key:
+                todo_to_move.sort_key = sort_key
+                await db.flush()
+            todo_to_move.order = position
+
+            return {
+                "message": "Todo order updated successfully",
+                "todo": AsyncTodoController._todo_payload(todo_to_move),
+            }
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Update todo order error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to update your todo order")
+
+    @staticmethod
+    async def update_completed(current_user: User, db: AsyncSession, id: uuid.UUID, is_completed: bool) -> dict:
+        try:
+            #get todo
+            todo = await AsyncTodoController._find(db, current_user, id)
+
+            #update todo completed
+            todo.is_completed = is_completed
+            await db.flush()
+            todo.order = await db.scalar(position_statement(todo))
+
+            return {
+                "message": "Todo completed updated successfully",
+                "todo": AsyncTodoController._todo_payload(todo),
+            }
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Update todo completed error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to update your todo completed")
+
+    @staticmethod
+    async def destroy(current_user: User, db: AsyncSession, id: uuid.UUID) -> dict:
+        try:
+            #get todo
+            todo = await AsyncTodoController._find(db, current_user, id)
+            todo.order = await db.scalar(position_statement(todo))
+            payload = AsyncTodoController._todo_payload(todo)
+
+            #delete todo (the others keep their keys; positions are computed at read time)
+            await db.delete(todo)
+            await db.flush()
+
+            return {
+                "message": "Todo deleted successfully",
+                "todo": payload,
+            }
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Destroy todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to delete your todo")
+
+    @staticmethod
+    async def _find(db: AsyncSession, current_user: User, id: uuid.UUID) -> Todo:
+        """Load one of the user's todos or raise 404."""
+        todo = (await db.scalars(_todo_statement(current_user.id, id))).first()
+        if not todo:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        return todo
+
+    @staticmethod
+    async def _positions(db: AsyncSession, current_user: User, todos: list) -> dict:
+        """See `TodoController._positions`."""
+        if not todos:
+            return {}
+        return dict((await db.execute(positions_statement(current_user.id, [t.id for t in todos]))).all())
+
+    @staticmethod
+    async def _key_for_position(db: AsyncSession, current_user: User, todo: Todo, index: int):
+        """See `TodoController._key_for_position`."""
+        neighbours = (await db.scalars(neighbours_statement(current_user.id, todo.id, index))).all()
+        if index == 0:
+            return key_for_index(todo.sort_key, index, neighbours, None), 1
+        if neighbours:
+            return key_for_index(todo.sort_key, index, neighbours, None), index + 1
+        highest, count = (await db.execute(tail_statement(current_user.id))).one()
+        return key_for_index(todo.sort_key, index, neighbours, highest), count
+
+    @staticmethod
+    def _todo_payload(todo: Todo) -> dict:
+        return {
+            "id": todo.id,
+            "order": todo.order,
+            "title": todo.title,
+            "description": todo.description,
+            "is_completed": todo.is_completed,
+            "due_date": todo.due_date,
+            "priority": todo.priority,
+        }
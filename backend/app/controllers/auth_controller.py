@@ -3,8 +3,10 @@ from datetime import datetime
 from typing import Optional
 from app.models.user import User
 from sqlalchemy.orm import Session  
-from app.utilis.auth import get_password_hash, verify_password, create_access_token
+from app.utilis.auth import create_access_token, hash_token
+from app.utilis.password_executor import hash_password, check_password
 from app.utilis.logger import get_logger
+from app.utilis import auth_cache
 from fastapi import HTTPException
 from uuid import uuid4
 from app.models.session import Session as SessionModel
@@ -23,41 +25,53 @@ class AuthController:
                 logger.warning(f"Login failed: User not found - {email}")
                 raise HTTPException(status_code=401, detail="Invalid credentials")
 
-            if not verify_password(password, user.hashed_password):
+            # The only bcrypt operation of a login (LoginRequest no longer verifies the
+            # password). Keeps the validation-error shape the clients already handle.
+            if not check_password(password, user.hashed_password):
                 logger.warning(f"Login failed: Invalid password - {email}")
-                raise HTTPException(status_code=401, detail="Invalid credentials")
-
-            access_token = create_access_token(data={"sub": str(user.id)})
-
-            session = SessionModel(
-                id=uuid4(),
-                user_id=user.id,
-                token=access_token,
-                last_used_at=datetime.utcnow()
-            )
-
-            db.add(session)
-            db.flush()  # Use flush instead of commit for test compatibility
-            db.refresh(session)
+                raise HTTPException(status_code=422, detail=[{
+                    "loc": ["body", "password"],
+                    "msg": "email or password are incorrect",
+                    "type": "value_error",
+                }])
 
+            response = AuthController._start_session(db, user)
             logger.info(f"Login successful for user: {user.id} ({email})")
-            
-            return {
-                "access_token": access_token,
-                "type": "Bearer",
-                "user": {
-                    "id": str(user.id),
-                    "name": user.name,
-                    "surname": user.surname,
-                    "email": user.email
-                }
-            }
+            return response
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Login error for {email}: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail="Internal server error")
 
+    @staticmethod
+    def _start_session(db: Session, user: User) -> dict:
+        """Create a session + access token for an authenticated user (login response)."""
+        access_token = create_access_token(data={"sub": str(user.id)})
+        # the new session is a write of this user: keep their next reads on the primary
+        db.info["user_id"] = user.id
+
+        session = SessionModel(
+            id=uuid4(),
+            user_id=user.id,
+            token_hash=hash_token(access_token),
+            last_used_at=datetime.utcnow()
+        )
+
+        db.add(session)
+        db.flush()  # Use flush instead of commit for test compatibility
+
+        return {
+            "access_token": access_token,
+            "type": "Bearer",
+            "user": {
+                "id": str(user.id),
+                "name": user.name,
+                "surname": user.surname,
+                "email": user.email
+            }
+        }
+
     @staticmethod
     def register(db: Session, name: str, surname: str, email: str, password: str, password_confirm: str) -> object:
         logger.info(f"Registration attempt for email: {email}")
@@ -69,7 +83,7 @@ class AuthController:
                 logger.warning(f"Registration failed: Email already exists - {email}")
                 raise HTTPException(status_code=400, detail="Email already exists")
             
-            password_hash = get_password_hash(password)
+            password_hash = hash_password(password)
             user = User(
                 id=uuid4(),
                 name=name,
@@ -83,9 +97,10 @@ class AuthController:
             db.refresh(user)
             logger.info(f"Registration successful for user: {user.id} ({email})")
 
-            # Automatically log the user in after successful registration
-            # This will create a session and return the same structure as the login endpoint
-            return AuthController.login(db, email, password)
+            # Automatically log the user in after successful registration: the
+            # password was just hashed, so issue the session directly instead of
+            # re-querying and re-verifying it (same structure as the login endpoint)
+            return AuthController._start_session(db, user)
         except HTTPException:
             raise
         except Exception as e:
@@ -100,6 +115,7 @@ class AuthController:
         
         try:
             # Delete the current session
+            auth_cache.invalidate_token(session.token_hash, db)
             db.delete(session)
             db.flush()  # Use flush instead of commit for test compatibility
             # Clear identity map so subsequent queries in the same Session
@@ -1,7 +1,7 @@
-from app.utilis.auth import verify_password
-from app.utilis.auth import get_password_hash
+from app.utilis.password_executor import hash_password, check_password
 from app.models.user import User
 from app.utilis.logger import get_logger
+from app.utilis import auth_cache
 from typing import List
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
@@ -34,6 +34,7 @@ class ProfileController:
             }
             db.query(User).filter(User.id == currenct_user.id).update(user)
             db.flush()
+            auth_cache.invalidate_user(currenct_user.id, db)
             
             return {
                 "message": "Profile updated successfully",
@@ -48,18 +49,21 @@ class ProfileController:
     @staticmethod
     def update_password(current_user: User, old_password: str, password: str, password_confirm: str, db: Session) -> object:
         try:
-            if verify_password(old_password, current_user.hashed_password) == False:
+            if check_password(old_password, current_user.hashed_password) == False:
                 raise HTTPException(status_code=401, detail="Old password is incorrect")
             
-            if verify_password(password, current_user.hashed_password) == True:
+            # the old password matched the stored hash, so the new one hashes to the
+            # same value exactly when it is equal (bcrypt only uses the first 72 bytes)
+            if password.encode('utf-8')[:72] == old_password.encode('utf-8')[:72]:
                 raise HTTPException(status_code=401, detail="New password cannot be the same as the old password")
 
-            newPasswordHash = get_password_hash(password)
+            newPasswordHash = hash_password(password)
             user = {
                 "hashed_password": newPasswordHash
             }
             db.query(User).filter(User.id == current_user.id).update(user)
             db.flush()
+            auth_cache.invalidate_user(current_user.id, db)
             
             return {
                 "message": "Password updated successfully",
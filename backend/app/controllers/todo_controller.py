@@ -1,17 +1,233 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, any_, bindparam, cast, column, delete, func, literal, select, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PostgresUUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
 from app.models.user import User
 from app.utilis.logger import get_logger
 from typing import List, Optional
 from app.models.todo import Todo
 import uuid
 from datetime import datetime
-from app.utilis.paginator import paginate
+from app.utilis.paginator import paginate, paginate_keyset, encode_cursor, decode_cursor
+from app.utilis.search import todo_search
+from app.utilis.todo_order import (
+    ORDER_GAP,
+    tail_statement,
+    position_statement,
+    positions_statement,
+    neighbours_statement,
+    rebalance_statement,
+    key_for_index,
+)
 from datetime import timezone
 
 
 logger = get_logger(__name__)
 
+
+# Hot fixed-shape queries as 2.0 select() statements: cheaper to build than
+# db.query(), and their compiled SQL is reused from the engine's statement cache
+# (sized by DB_QUERY_CACHE_SIZE). Shared with AsyncTodoController.
+def _todo_statement(user_id: uuid.UUID, todo_id: uuid.UUID):
+    return select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id)
+
+
+def _title_taken_statement(user_id: uuid.UUID, title: str):
+    return select(Todo.id).where(Todo.user_id == user_id, Todo.title == title).limit(1)
+
+
+def _filter_criteria(db, search: Optional[str], completed: Optional[bool], due_date: Optional[str], priority: Optional[str]):
+    """(criteria, rank) of the list filters shared by index and bulk updates; rank is None unless searching."""
+    criteria = []
+
+    # full-text match on title + description (substring fallback off Postgres)
+    rank = None
+    if search:
+        criterion, rank = todo_search(db, search)
+        criteria.append(criterion)
+
+    # apply completed filter only when explicitly provided (True or False)
+    if completed is not None:
+        criteria.append(Todo.is_completed == completed)
+
+    if due_date:
+        criteria.append(Todo.due_date == due_date)
+
+    if priority:
+        criteria.append(Todo.priority == priority)
+
+    return criteria, rank
+
+
+# column changed by each bulk operation, and its new value
+_BULK_CHANGES = {
+    "complete": ("is_completed", True),
+    "uncomplete": ("is_completed", False),
+}
+
+
+def _bulk_update_statement(user_id: uuid.UUID, operation: str, criteria: list, priority: Optional[str] = None):
+    """One set-based UPDATE/DELETE over the user's todos matching `criteria`.
+
+    Rows already holding the new value are left alone, so the row count is the
+    number of todos actually changed.
+    """
+    where = [Todo.user_id == user_id, *criteria]
+    if operation == "delete":
+        return delete(Todo).where(*where)
+    name, value = _BULK_CHANGES.get(operation, ("priority", priority))
+    target = Todo.__table__.c[name]
+    return (
+        update(Todo)
+        .where(*where, target.is_distinct_from(value))
+        .values({name: value})
+    )
+
+
+def _bulk_criteria(db, ids: Optional[List[uuid.UUID]], filters: Optional[dict]) -> list:
+    """Selection of a bulk update: `id = ANY(:ids)` (one array parameter) or the list filters."""
+    if ids is not None:
+        return [Todo.id == any_(bindparam("ids", list(ids), type_=ARRAY(PostgresUUID(as_uuid=True))))]
+    return _filter_criteria(db, **filters)[0]
+
+
+# Columns of a list item: what the client renders, plus sort_key for cursors.
+# List endpoints select these as rows instead of hydrating Todo objects.
+_LIST_COLUMNS = (Todo.id, Todo.title, Todo.description, Todo.is_completed, Todo.due_date, Todo.priority, Todo.sort_key)
+
+
+def _list_cursor(row, positions: Optional[dict]) -> str:
+    """Keyset cursor past `row`. Unfiltered lists also carry its position (`positions`),
+    so the next page is numbered without a `row_number()` over the whole list."""
+    if positions is None:
+        return encode_cursor([row.sort_key, row.id])
+    return encode_cursor([row.sort_key, row.id, positions[row.id]])
+
+
+def _list_items(rows: list, positions: dict) -> List[dict]:
+    """`TodoItem`s of a page of `_LIST_COLUMNS` rows, with their 1-based positions ({id: position})."""
+    return [
+        {
+            "id": row.id,
+            "order": positions.get(row.id),
+            "title": row.title,
+            "description": row.description,
+            "is_completed": row.is_completed,
+            "due_date": row.due_date,
+            "priority": row.priority,
+        }
+        for row in rows
+    ]
+
+
+_STORED_COLUMNS = ("id", "user_id", "title", "description", "is_completed", "due_date", "priority")
+
+
+def _store_statement(user_id: uuid.UUID, **values):
+    """Append a todo in one statement, or insert nothing if the title is taken.
+
+    INSERT ... SELECT takes the key from the user's current highest one and
+    ON CONFLICT on `uq_todos_user_id_title` replaces the duplicate-title check.
+    RETURNING adds the 1-based position: its sub-select runs on the statement's
+    snapshot, so it counts the todos that were there before the new one.
+    """
+    values = {"id": uuid.uuid4(), "user_id": user_id, "is_completed": False, **values}
+    before = aliased(Todo)
+    position = select(func.count()).select_from(before).where(before.user_id == user_id).scalar_subquery()
+    tail = select(
+        *(literal(values[name], Todo.__table__.c[name].type) for name in _STORED_COLUMNS),
+        func.coalesce(func.max(Todo.sort_key), 0) + ORDER_GAP,
+    ).where(Todo.user_id == user_id)
+    return (
+        insert(Todo)
+        .from_select([*_STORED_COLUMNS, "sort_key"], tail)
+        .on_conflict_do_nothing(index_elements=["user_id", "title"])
+        .returning(*(Todo.__table__.c[name] for name in _STORED_COLUMNS), (position + 1).label("order"))
+    )
+
+
+def _bulk_store_statement(user_id: uuid.UUID, items: List[dict]):
+    """Append several todos with one multi-row INSERT; taken titles are skipped.
+
+    The rows get consecutive keys after the user's highest one, in list order.
+    RETURNING adds each row's `sort_key` and the number of todos the user had
+    before the statement (see `_store_statement`), from which the caller
+    numbers the created block.
+    """
+    table = Todo.__table__
+    names = ("id", "title", "description", "due_date", "priority")
+    batch = values(
+        *(column(name, table.c[name].type) for name in names),
+        column("slot", Integer),
+        name="batch",
+    ).data([
+        (uuid.uuid4(), *(item[name] for name in names[1:]), slot)
+        for slot, item in enumerate(items, start=1)
+    ])
+    existing = aliased(Todo)
+    highest = (
+        select(func.coalesce(func.max(existing.sort_key), 0))
+        .where(existing.user_id == user_id)
+        .scalar_subquery()
+    )
+    before = select(func.count()).select_from(existing).where(existing.user_id == user_id).scalar_subquery()
+    # VALUES columns are untyped in Postgres (NULL rows read as text): cast them back
+    rows = select(
+        batch.c.id,
+        literal(user_id, table.c.user_id.type),
+        *(cast(batch.c[name], table.c[name].type) for name in ("title", "description")),
+        literal(False),
+        *(cast(batch.c[name], table.c[name].type) for name in ("due_date", "priority")),
+        highest + batch.c.slot * ORDER_GAP,
+    )
+    return (
+        insert(Todo)
+        .from_select([*_STORED_COLUMNS, "sort_key"], rows)
+        .on_conflict_do_nothing(index_elements=["user_id", "title"])
+        .returning(*(table.c[name] for name in _STORED_COLUMNS), table.c.sort_key, before.label("before"))
+    )
+
+
+def _bulk_store_results(items: List[dict], created: list) -> dict:
+    """Per-item results of a bulk create, in request order.
+
+    `created` are the `_bulk_store_statement` rows; an item without one had a
+    title already taken (by an existing todo or an earlier item).
+    """
+    created = sorted(created, key=lambda row: row.sort_key)
+    by_title = {
+        row.title: _stored_payload(row, order=row.before + position)
+        for position, row in enumerate(created, start=1)
+    }
+    results = []
+    for index, item in enumerate(items):
+        todo = by_title.pop(item["title"], None)
+        if todo is None:
+            results.append({"index": index, "status": 409, "detail": "Title already exists"})
+        else:
+            results.append({"index": index, "status": 200, "todo": todo})
+    return {
+        "message": "Todos stored successfully",
+        "created": len(created),
+        "results": results,
+    }
+
+
+def _stored_payload(row, order: Optional[int] = None) -> dict:
+    """Response body of a todo created by `_store_statement`."""
+    return {
+        "id": row.id,
+        "order": row.order if order is None else order,
+        "title": row.title,
+        "description": row.description,
+        "is_completed": row.is_completed,
+        "due_date": row.due_date,
+        "priority": row.priority,
+    }
+
+
 class TodoController:
     
     @staticmethod
@@ -23,41 +239,69 @@ class TodoController:
             search: Optional[str], 
             completed: Optional[bool], 
             due_date: Optional[str], 
-            priority: Optional[str]) -> List[Todo]:
+            priority: Optional[str],
+            cursor: Optional[str] = None) -> dict:
         try:
-            todos = db.query(Todo).filter(Todo.user_id == current_user.id)
-            
-            if search:
-                todos = todos.filter(Todo.title.contains(search))
-            
-            # apply completed filter only when explicitly provided (True or False)
-            if completed is not None:
-                todos = todos.filter(Todo.is_completed == completed)
+            # search, completed, due date and priority filters (only those provided)
+            criteria, rank = _filter_criteria(db, search, completed, due_date, priority)
+            todos = db.query(*_LIST_COLUMNS).filter(Todo.user_id == current_user.id, *criteria)
             
-            if due_date:
-                todos = todos.filter(Todo.due_date == due_date)
-            
-            if priority:
-                todos = todos.filter(Todo.priority == priority)
-            
-            # order todos by their explicit order value (1 = top)
-            todos = todos.order_by(Todo.order.asc()).all()
-
             # sane defaults and max limit for page size
             if not page_size:
                 page_size = 20
             elif page_size > 50:
                 page_size = 50
 
-            # aplica paginação
+            # unfiltered pages are a contiguous slice of the list: positions follow from where the page starts
+            filtered = bool(search) or completed is not None or bool(due_date) or bool(priority)
+
+            # keyset mode: seek past the (sort_key, id) of the cursor, cost independent of depth
+            if cursor:
+                sort_key, todo_id, *after = decode_cursor(cursor)
+                items_on_page, next_cursor = paginate_keyset(
+                    todos, [Todo.sort_key, Todo.id], [int(sort_key), uuid.UUID(todo_id)], page_size
+                )
+                if filtered or not after:
+                    positions = TodoController._positions(db, current_user, items_on_page)
+                else:
+                    # the cursor carries the position of the row it seeks past
+                    positions = {t.id: int(after[0]) + 1 + i for i, t in enumerate(items_on_page)}
+                if next_cursor:
+                    next_cursor = _list_cursor(items_on_page[-1], None if filtered else positions)
+                return {
+                    "items": _list_items(items_on_page, positions),
+                    "page_size": page_size,
+                    "next_cursor": next_cursor,
+                }
+
+            # order todos by their sort key (lowest = top), id breaks ties;
+            # searches list the best matches first
+            if rank is not None:
+                todos = todos.order_by(rank.desc(), Todo.sort_key.asc(), Todo.id.asc())
+            else:
+                todos = todos.order_by(Todo.sort_key.asc(), Todo.id.asc())
+
+            # aplica paginação (LIMIT/OFFSET no banco)
             items_on_page, paginator = paginate(todos, page or 1, page_size)
 
+            if filtered:
+                positions = TodoController._positions(db, current_user, items_on_page)
+            else:
+                first = (paginator.page - 1) * paginator.page_size + 1
+                positions = {t.id: first + i for i, t in enumerate(items_on_page)}
+
+            # cursor to continue in keyset mode from this page (only valid for (sort_key, id) ordering)
+            next_cursor = None
+            if paginator.has_next and items_on_page and rank is None:
+                next_cursor = _list_cursor(items_on_page[-1], None if filtered else positions)
+
             # retorna no formato desejado
             return {
-                "items": items_on_page,
+                "items": _list_items(items_on_page, positions),
                 "page": paginator.page,
                 "page_size": paginator.page_size,
                 "total": paginator.total_items,
+                "next_cursor": next_cursor,
             }
         except HTTPException as e:
             raise e
@@ -67,13 +311,13 @@ class TodoController:
 
     
     @staticmethod
-    def today(current_user: User, db: Session, priority: Optional[str] = None) -> List[Todo]:
+    def today(current_user: User, db: Session, priority: Optional[str] = None) -> dict:
         try:
             now_utc = datetime.now(timezone.utc)
             start_of_day = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
             end_of_day = start_of_day.replace(hour=23, minute=59, second=59, microsecond=999999)
 
-            todos = db.query(Todo).filter(
+            todos = db.query(*_LIST_COLUMNS).filter(
                 Todo.user_id == current_user.id,
                 Todo.is_completed == False,  # noqa: E712
                 Todo.due_date >= start_of_day,
@@ -83,13 +327,14 @@ class TodoController:
             if priority:
                 todos = todos.filter(Todo.priority == priority)
 
-            todos = todos.order_by(Todo.order.asc()).all()
+            todos = todos.order_by(Todo.sort_key.asc(), Todo.id.asc())
 
             page_size = 50
             items_on_page, paginator = paginate(todos, 1, page_size)
+            positions = TodoController._positions(db, current_user, items_on_page)
 
             return {
-                "items": items_on_page,
+                "items": _list_items(items_on_page, positions),
                 "page": paginator.page,
                 "page_size": paginator.page_size,
                 "total": paginator.total_items,
@@ -104,43 +349,20 @@ class TodoController:
     @staticmethod
     def store(current_user: User, db: Session, title: str, description: str, priority: str, due_date: datetime) -> dict:
         try:
-            #check if title already exists
-            chekSameTitleTodo = db.query(Todo).filter(Todo.user_id == current_user.id, Todo.title == title).first()
-            if chekSameTitleTodo:
-                raise HTTPException(status_code=409, detail="Title already exists")
-
-            #get more high order todo
-            getMoreHighOrderTodo = db.query(Todo).filter(Todo.user_id == current_user.id).order_by(Todo.order.desc()).first()
-            if not getMoreHighOrderTodo:
-                order = 1
-            else:
-                order = getMoreHighOrderTodo.order + 1
-
-            newTodo = Todo(
-                id=uuid.uuid4(),
-                order=order,
-                user_id=current_user.id,
+            #append after the highest key; a taken title inserts nothing
+            stored = db.execute(_store_statement(
+                current_user.id,
                 title=title,
                 description=description,
-                is_completed=False,
-                due_date=due_date,
                 priority=priority,
-            )
-
-            db.add(newTodo)
-            db.flush()
+                due_date=due_date,
+            )).first()
+            if stored is None:
+                raise HTTPException(status_code=409, detail="Title already exists")
 
             return {
                 "message": "Todo stored successfully",
-                "todo": {
-                    "id": newTodo.id,
-                    "order": newTodo.order,
-                    "title": newTodo.title,
-                    "description": newTodo.description,
-                    "is_completed": newTodo.is_completed,
-                    "due_date": newTodo.due_date,
-                    "priority": newTodo.priority,
-                }
+                "todo": _stored_payload(stored),
             }
 
         except HTTPException as e:
@@ -150,17 +372,63 @@ class TodoController:
             raise HTTPException(status_code=500, detail="We found some issue trying to store your todo")
 
     
+    @staticmethod
+    def bulk_store(current_user: User, db: Session, items: List[dict]) -> dict:
+        try:
+            #first item of each title; later copies are reported as taken
+            unique = {}
+            for item in items:
+                unique.setdefault(item["title"], item)
+
+            #one multi-row INSERT, taken titles are skipped by the unique index
+            created = db.execute(_bulk_store_statement(current_user.id, list(unique.values()))).all()
+
+            return _bulk_store_results(items, created)
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Bulk store todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to store your todos")
+
+
+    @staticmethod
+    def bulk_update(
+            current_user: User,
+            db: Session,
+            operation: str,
+            ids: Optional[List[uuid.UUID]],
+            filters: Optional[dict],
+            priority: Optional[str] = None) -> dict:
+        try:
+            #one UPDATE/DELETE over every selected todo of the user
+            criteria = _bulk_criteria(db, ids, filters)
+            result = db.execute(_bulk_update_statement(current_user.id, operation, criteria, priority))
+
+            return {
+                "message": "Todos updated successfully",
+                "operation": operation,
+                "affected": result.rowcount,
+            }
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Bulk update todo error for user {current_user.id}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="We found some issue trying to update your todos")
+
+
     @staticmethod
     def update(current_user: User, db: Session, id: uuid.UUID, title: str, description: str, priority: str, due_date: datetime) -> dict:
         try:
             # get todo
-            todo = db.query(Todo).filter(Todo.id == id, Todo.user_id == current_user.id).first()
+            todo = db.scalars(_todo_statement(current_user.id, id)).first()
             if not todo:
                 raise HTTPException(status_code=404, detail="Todo not found")
 
             # check if title already exists
             if title != todo.title:
-                chekSameTitleTodo = db.query(Todo).filter(Todo.user_id == current_user.id, Todo.title == title).first()
+                chekSameTitleTodo = db.scalar(_title_taken_statement(current_user.id, title))
                 if chekSameTitleTodo:
                     raise HTTPException(status_code=409, detail="Title already exists")
 
@@ -175,7 +443,12 @@ class TodoController:
             todo.priority = priority
             todo.due_date = due_date
             db.add(todo)
-            db.flush()
+            try:
+                db.flush()
+            except IntegrityError:
+                # another request took the title since the check above
+                raise HTTPException(status_code=409, detail="Title already exists")
+            todo.order = db.scalar(position_statement(todo))
 
             return {
                 "message": "Todo completed updated successfully",
@@ -200,32 +473,26 @@ class TodoController:
     @staticmethod
     def update_order(current_user: User, db: Session, id: uuid.UUID, order: int) -> dict:
         try:
-            # get todos for the user ordered by current position
-            todos = db.query(Todo).filter(Todo.user_id == current_user.id).order_by(Todo.order).all()
-
-            # find the todo with the given id
-            current_index = next((idx for idx, t in enumerate(todos) if t.id == id), None)
-            if current_index is None:
+            # get todo
+            todo_to_move = db.scalars(_todo_statement(current_user.id, id)).first()
+            if not todo_to_move:
                 raise HTTPException(status_code=404, detail="Todo not found")
 
             # interpret `order` as the desired 1-based position in the list
-            if order < 1:
-                new_index = 0
-            elif order > len(todos):
-                new_index = len(todos) - 1
-            else:
-                new_index = order - 1
-
-            # remove the todo from its current position and insert at the new index
-            todo_to_move = todos.pop(current_index)
-            todos.insert(new_index, todo_to_move)
+            index = max(order, 1) - 1
 
-            # re-assign sequential order values so DB matches visual order
-            for idx, todo in enumerate(todos, start=1):
-                todo.order = idx
-                db.add(todo)
+            # only the todo moves: its new key goes between its new neighbours
+            sort_key, position = TodoController._key_for_position(db, current_user, todo_to_move, index)
+            if sort_key is None:
+                # no gap left between the neighbours, respace the list once and retry
+                db.execute(rebalance_statement(current_user.id))
+                db.refresh(todo_to_move)
+                sort_key, position = TodoController._key_for_position(db, current_user, todo_to_move, index)
 
-            db.flush()
+            if sort_key != todo_to_move.sort_key:
+                todo_to_move.sort_key = sort_key
+                db.flush()
+            todo_to_move.order = position
 
             return {
                 "message": "Todo order updated successfully",
@@ -250,7 +517,7 @@ class TodoController:
     def update_completed(current_user: User, db: Session, id: uuid.UUID, is_completed: bool) -> dict:
         try:
             #get todo
-            todo = db.query(Todo).filter(Todo.id == id, Todo.user_id == current_user.id).first()
+            todo = db.scalars(_todo_statement(current_user.id, id)).first()
             if not todo:
                 raise HTTPException(status_code=404, detail="Todo not found")
 
@@ -258,6 +525,7 @@ class TodoController:
             todo.is_completed = is_completed
             db.add(todo)
             db.flush()
+            todo.order = db.scalar(position_statement(todo))
 
             return {
                 "message": "Todo completed updated successfully",
@@ -282,20 +550,14 @@ class TodoController:
     def destroy(current_user: User, db: Session, id: uuid.UUID) -> dict:
         try:
             #get todo
-            todo = db.query(Todo).filter(Todo.id == id, Todo.user_id == current_user.id).first()
+            todo = db.scalars(_todo_statement(current_user.id, id)).first()
             if not todo:
                 raise HTTPException(status_code=404, detail="Todo not found")
 
-            #delete todo
-            db.delete(todo)
-            db.flush()
-
-            # normalize remaining todos order so it stays contiguous (1..N)
-            remaining_todos = db.query(Todo).filter(Todo.user_id == current_user.id).order_by(Todo.order).all()
-            for idx, t in enumerate(remaining_todos, start=1):
-                t.order = idx
-                db.add(t)
+            todo.order = db.scalar(position_statement(todo))
 
+            #delete todo (the others keep their keys; positions are computed at read time)
+            db.delete(todo)
             db.flush()
 
             return {
@@ -315,4 +577,23 @@ class TodoController:
             raise e
         except Exception as e:
             logger.error(f"Destroy todo error for user {current_user.id}: {str(e)}", exc_info=True)
-            raise HTTPException(status_code=500, detail="We found some issue trying to delete your todo")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="We found some issue trying to delete your todo")
+
+    @staticmethod
+    def _positions(db: Session, current_user: User, todos: list) -> dict:
+        """1-based list positions ({id: position}) of the todos of a filtered/seeked page."""
+        if not todos:
+            return {}
+        return dict(db.execute(positions_statement(current_user.id, [t.id for t in todos])).all())
+
+    @staticmethod
+    def _key_for_position(db: Session, current_user: User, todo: Todo, index: int):
+        """(sort_key, 1-based position) placing `todo` at 0-based `index`; sort_key None = no gap left."""
+        neighbours = db.scalars(neighbours_statement(current_user.id, todo.id, index)).all()
+        if index == 0:
+            return key_for_index(todo.sort_key, index, neighbours, None), 1
+        if neighbours:
+            return key_for_index(todo.sort_key, index, neighbours, None), index + 1
+        # past the end: the todo goes last
+        highest, count = db.execute(tail_statement(current_user.id)).one()
+        return key_for_index(todo.sort_key, index, neighbours, highest), count
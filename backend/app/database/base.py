@@ -1,7 +1,10 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Depends
 import os
+import re
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -9,6 +12,9 @@ from pathlib import Path
 env_path = Path(__file__).resolve().parent.parent.parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+from app.database.pool import pool_options  # noqa: E402 - these modules read settings loaded above
+from app.database.replicas import ReplicaRouter, RoutingSession  # noqa: E402
+
 # Get database URL from environment or construct it
 database_url = os.getenv("DATABASE_URL")
 
@@ -27,11 +33,29 @@ if not database_url:
 if not database_url:
     raise ValueError("DATABASE_URL or POSTGRES_* environment variables must be set")
 
-# Create engine
-engine = create_engine(database_url, echo=False)  # Set to False to reduce SQL log noise
+# Create engine (pool sizing/timeouts come from .env, see app/database/pool.py)
+engine = create_engine(database_url, echo=False, **pool_options(database_url))  # Set to False to reduce SQL log noise
+
+# Optional read replicas (comma separated), used by read-only endpoints through get_read_db
+replica_urls = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+replica_engines = [create_engine(url, echo=False, **pool_options(url)) for url in replica_urls]
+replica_router = ReplicaRouter(replica_engines)
+
+# Create SessionLocal class (sessions route reads to replicas when marked read-only)
+SessionLocal = sessionmaker(class_=RoutingSession, router=replica_router, autocommit=False, autoflush=False, bind=engine)
+
+# Async stack (asyncpg). When DATABASE_ASYNC=true the API is served by the async
+# routers/controllers; request validators keep using the sync engine above.
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() == "true"
+async_database_url = os.getenv("DATABASE_ASYNC_URL") or re.sub(
+    r"^postgres(ql)?(\+\w+)?://", "postgresql+asyncpg://", database_url
+)
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# The engine does not connect until first use, so it costs nothing in sync mode
+async_engine = create_async_engine(async_database_url, echo=False, **pool_options(async_database_url, is_async=True))
+
+# expire_on_commit=False: attributes must not lazy-load after commit in async code
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -61,4 +85,28 @@ def get_db():
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db(db: Session = Depends(get_db)):
+    """`get_db` for read-only endpoints: its SELECTs may be served by a replica.
+
+    Declare it before the auth dependency so the session/user lookup is routed too;
+    writes in the same request (e.g. the session touch) still go to the primary.
+    """
+    db.info["read_only"] = True
+    return db
+
+
+async def get_async_db():
+    """Async counterpart of `get_db` yielding an `AsyncSession`.
+
+    Same semantics: commit on success, rollback on error. Overridden in tests.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
@@ -2,7 +2,7 @@ from datetime import datetime
 from uuid import uuid4
 
 from app.models.session import Session
-from app.utilis.auth import create_access_token
+from app.utilis.auth import create_access_token, hash_token
 
 
 def fake_session_data(*, user_id) -> dict:
@@ -36,6 +36,6 @@ def make_session(
     return Session(
         id=id,
         user_id=user_id,
-        token=token,
+        token_hash=hash_token(token),
         last_used_at=last_used_at,
     )
\ No newline at end of file
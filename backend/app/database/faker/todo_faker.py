@@ -41,7 +41,7 @@ def make_todo(
     *,
     user_id,
     id=None,
-    order=0,
+    sort_key=0,
     title=None,
     description=None,
     is_completed=False,
@@ -64,7 +64,7 @@ def make_todo(
 
     return Todo(
         id=id,
-        order=order,
+        sort_key=sort_key,
         user_id=user_id,
         title=title,
         description=description,
@@ -0,0 +1,29 @@
+"""add_todos_user_order_id_index
+
+Revision ID: 8b2d4c61a9f3
+Revises: 3ef53d63d485
+Create Date: 2026-10-17 09:12:40.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d4c61a9f3'
+down_revision: Union[str, Sequence[str], None] = '3ef53d63d485'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs keyset pagination of GET /todos: WHERE user_id = ? AND (order, id) > (?, ?)
+    op.create_index('ix_todos_user_id_order_id', 'todos', ['user_id', 'order', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_todos_user_id_order_id', table_name='todos')
@@ -0,0 +1,56 @@
+"""sparse_todo_sort_key
+
+Revision ID: a3d8e6f1b297
+Revises: f7c3a1d9e204
+Create Date: 2026-10-17 14:05:12.337104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d8e6f1b297'
+down_revision: Union[str, Sequence[str], None] = 'f7c3a1d9e204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# keep in sync with app.utilis.todo_order.ORDER_GAP
+ORDER_GAP = 1024
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # todos.order (contiguous 1..N positions) becomes todos.sort_key, a sparse key:
+    # moving a todo rewrites one row instead of renumbering the whole list
+    op.alter_column('todos', 'order', new_column_name='sort_key')
+    op.execute(f"""
+        UPDATE todos SET sort_key = ranked.position * {ORDER_GAP}
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY user_id ORDER BY sort_key, id) AS position
+            FROM todos
+        ) AS ranked
+        WHERE todos.id = ranked.id
+    """)
+    # keys only move outwards by ORDER_GAP on appends and moves to the top: 64 bits
+    # keep a user from ever running out of range
+    op.alter_column('todos', 'sort_key', existing_type=sa.Integer(), type_=sa.BigInteger(), nullable=False)
+    op.execute('ALTER INDEX ix_todos_user_id_order_id RENAME TO ix_todos_user_id_sort_key_id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER INDEX ix_todos_user_id_sort_key_id RENAME TO ix_todos_user_id_order_id')
+    op.alter_column('todos', 'sort_key', existing_type=sa.BigInteger(), nullable=True)
+    op.execute("""
+        UPDATE todos SET sort_key = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY user_id ORDER BY sort_key, id) AS position
+            FROM todos
+        ) AS ranked
+        WHERE todos.id = ranked.id
+    """)
+    op.alter_column('todos', 'sort_key', existing_type=sa.BigInteger(), type_=sa.Integer())
+    op.alter_column('todos', 'sort_key', new_column_name='order')
@@ -0,0 +1,71 @@
+"""unique_todo_title_per_user
+
+Revision ID: b6f2c9e4d173
+Revises: a3d8e6f1b297
+Create Date: 2026-10-17 16:42:08.519377
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f2c9e4d173'
+down_revision: Union[str, Sequence[str], None] = 'a3d8e6f1b297'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_valid(name: str) -> Optional[bool]:
+    """pg_index.indisvalid of an index, None when it does not exist."""
+    return op.get_bind().execute(
+        sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    A user's titles become unique in the database, so `TodoController.store`
+    can insert with ON CONFLICT instead of checking first. Duplicates that
+    slipped through the old check-then-insert race keep their oldest row; the
+    others get their id appended to the title.
+    """
+    op.execute("""
+        UPDATE todos SET title = left(todos.title, 216) || ' (' || todos.id::text || ')'
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY user_id, title ORDER BY created_at, id) AS copy
+            FROM todos
+        ) AS ranked
+        WHERE todos.id = ranked.id AND ranked.copy > 1
+    """)
+
+    with op.get_context().autocommit_block():
+        # a build that failed earlier (e.g. a duplicate inserted by the old app after
+        # the UPDATE above) leaves an INVALID index that if_not_exists would keep
+        if _index_valid('uq_todos_user_id_title') is False:
+            op.drop_index('uq_todos_user_id_title', table_name='todos', postgresql_concurrently=True)
+        # title lookups: WHERE user_id = ? AND title = ?, and the ON CONFLICT target
+        op.create_index(
+            'uq_todos_user_id_title', 'todos',
+            ['user_id', 'title'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Postgres ignores invalid indexes for ON CONFLICT: every insert would fail
+        if not _index_valid('uq_todos_user_id_title'):
+            raise RuntimeError(
+                "uq_todos_user_id_title is invalid (duplicate titles were inserted during the build); "
+                "run the migration again"
+            )
+        # every title query is scoped by user_id, the unique index above serves them
+        op.drop_index('ix_todos_title', table_name='todos', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_todos_title', 'todos', ['title'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('uq_todos_user_id_title', table_name='todos', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,58 @@
+"""composite_todo_indexes
+
+Revision ID: c41e7f0a2b58
+Revises: 8b2d4c61a9f3
+Create Date: 2026-10-17 10:03:27.194806
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7f0a2b58'
+down_revision: Union[str, Sequence[str], None] = '8b2d4c61a9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Indexes match the real query shapes of TodoController. `(user_id, order)` is
+    already served by `ix_todos_user_id_order_id`. CREATE/DROP INDEX CONCURRENTLY
+    cannot run inside a transaction, so everything runs in an autocommit block
+    and does not lock the table against writes.
+    """
+    with op.get_context().autocommit_block():
+        # index filters: WHERE user_id = ? AND is_completed = ? [AND due_date = ?]
+        op.create_index(
+            'ix_todos_user_id_is_completed_due_date', 'todos',
+            ['user_id', 'is_completed', 'due_date'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        # today: WHERE user_id = ? AND is_completed = false AND due_date BETWEEN ? AND ?
+        op.create_index(
+            'ix_todos_user_id_due_date_open', 'todos',
+            ['user_id', 'due_date'],
+            unique=False, postgresql_where=sa.text('is_completed = false'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+        # single-column indexes made redundant by the composites above (every todo
+        # query is scoped by user_id); dropping them cuts index writes per row change
+        for index_name in ('ix_todos_user_id', 'ix_todos_is_completed', 'ix_todos_due_date', 'ix_todos_priority'):
+            op.drop_index(index_name, table_name='todos', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_todos_priority', 'todos', ['priority'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_todos_due_date', 'todos', ['due_date'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_todos_is_completed', 'todos', ['is_completed'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_todos_user_id', 'todos', ['user_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_todos_user_id_due_date_open', table_name='todos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_todos_user_id_is_completed_due_date', table_name='todos', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,48 @@
+"""todo_search_vector
+
+Revision ID: e5a90d3b7c12
+Revises: c41e7f0a2b58
+Create Date: 2026-10-17 11:26:05.731942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a90d3b7c12'
+down_revision: Union[str, Sequence[str], None] = 'c41e7f0a2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Adds a stored tsvector over title + description for GET /todos?search= and
+    a GIN index on it. Adding a stored generated column rewrites the table, so
+    run this in a maintenance window on large databases; the index itself is
+    built CONCURRENTLY.
+    """
+    op.add_column('todos', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))", persisted=True),
+        nullable=True,
+    ))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_todos_search_vector', 'todos', ['search_vector'],
+            unique=False, postgresql_using='gin',
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_todos_search_vector', table_name='todos', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('todos', 'search_vector')
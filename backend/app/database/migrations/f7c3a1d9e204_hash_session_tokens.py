@@ -0,0 +1,52 @@
+"""hash_session_tokens
+
+Revision ID: f7c3a1d9e204
+Revises: e5a90d3b7c12
+Create Date: 2026-10-17 13:41:52.806117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3a1d9e204'
+down_revision: Union[str, Sequence[str], None] = 'e5a90d3b7c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Replaces `sessions.token` (full JWT) with `token_hash`, the 32-byte SHA-256
+    digest of the token, behind a unique index. Existing sessions are backfilled
+    so logged-in users stay logged in.
+    """
+    op.add_column('sessions', sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+    # same digest as app.utilis.auth.hash_token()
+    op.execute("UPDATE sessions SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    # identical tokens (issued in the same second) collapse into the newest session
+    op.execute(
+        "DELETE FROM sessions a USING sessions b "
+        "WHERE a.token_hash = b.token_hash AND (a.created_at, a.id) < (b.created_at, b.id)"
+    )
+    op.alter_column('sessions', 'token_hash', nullable=False)
+    op.create_index(op.f('ix_sessions_token_hash'), 'sessions', ['token_hash'], unique=True)
+    op.drop_index(op.f('ix_sessions_token'), table_name='sessions')
+    op.drop_column('sessions', 'token')
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Raw tokens cannot be recovered from their digests, so all sessions are
+    removed and users have to log in again.
+    """
+    op.execute("DELETE FROM sessions")
+    op.add_column('sessions', sa.Column('token', sa.String(length=255), nullable=False))
+    op.create_index(op.f('ix_sessions_token'), 'sessions', ['token'], unique=False)
+    op.drop_index(op.f('ix_sessions_token_hash'), table_name='sessions')
+    op.drop_column('sessions', 'token_hash')
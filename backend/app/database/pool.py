@@ -0,0 +1,144 @@
+"""Connection pool configuration and instrumentation.
+
+Every engine of the app is created with `pool_options()`, so pool sizing,
+recycling, pre-ping, checkout timeout, the per-connection `statement_timeout`,
+the compiled statement cache and server-side prepared statements all come
+from `.env`. The pools are `TimedQueuePool`s,
+which record how long requests wait for a connection; `pool_status()`
+returns those numbers together with the live checkout/overflow counters.
+"""
+import os
+import threading
+import time
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Connections kept open per worker
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+# Extra connections opened under load, closed again when returned
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+# Seconds to wait for a free connection before failing
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Seconds after which a connection is replaced (-1 = never)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Test connections on checkout so a Postgres restart doesn't surface as errors
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Server-side limit for a single statement, in milliseconds (0 = no limit)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+# Compiled SQL kept per engine; must hold every statement shape the app issues
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+# psycopg 3: executions of the same query before it is prepared server-side (-1 = never)
+DB_PREPARE_THRESHOLD = int(os.getenv("DB_PREPARE_THRESHOLD", "2"))
+
+
+class PoolWaitStats:
+    """Time spent waiting for a connection to be checked out of a pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+class _TimedGetMixin:
+    """Times `_do_get`, the call that blocks while the pool is exhausted."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        # dispose() swaps in a new pool; keep the counters across it
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedGetMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _connect_args(url: str) -> dict:
+    """Driver-specific arguments: `statement_timeout` and server-side prepared statements.
+
+    asyncpg always prepares statements (and caches them per connection);
+    psycopg 3 prepares a query after `DB_PREPARE_THRESHOLD` executions;
+    psycopg2 cannot prepare server-side.
+    """
+    if not url.startswith("postgres"):
+        return {}
+    driver = make_url(url).get_driver_name()
+    connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        if driver == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    if driver == "psycopg":
+        connect_args["prepare_threshold"] = DB_PREPARE_THRESHOLD if DB_PREPARE_THRESHOLD >= 0 else None
+    return connect_args
+
+
+def pool_options(url: str, is_async: bool = False) -> dict:
+    """Keyword arguments for `create_engine` / `create_async_engine`."""
+    return {
+        "query_cache_size": DB_QUERY_CACHE_SIZE,
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": _connect_args(url),
+    }
+
+
+def pool_status(engine: Engine) -> dict:
+    """Live counters of an engine's pool, for monitoring."""
+    pool = engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.as_dict())
+    return status
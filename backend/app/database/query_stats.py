@@ -0,0 +1,145 @@
+"""Per-request database statistics and slow/repeated statement detection.
+
+`track_queries()` starts counting for the current request; from then on every
+statement executed by any engine of the app (sync, async, replicas) adds to
+the returned `QueryStats`. The stats object lives in a context variable, so
+sync routes (run in the threadpool with a copy of the request context) and
+async routes both report into the request that issued the query.
+
+The request middleware turns the stats into a `Server-Timing` header and
+access log fields, and `check_queries()` warns about requests over
+`SQL_QUERY_BUDGET` statements or repeating one statement (N+1 loops).
+Statements slower than `SQL_SLOW_QUERY_MS` are logged with their parameters
+redacted. With `SQL_STATS_ENABLED=false` no engine listener is registered
+and none of this runs.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utilis.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Count statements and DB time per request (false = no engine hooks, no Server-Timing header)
+SQL_STATS_ENABLED = os.getenv("SQL_STATS_ENABLED", "true").lower() == "true"
+# Statements a request may issue before it is logged as over budget (0 = no budget)
+SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "20"))
+# Times one statement may run in a request before it is logged as a likely N+1 (0 = off)
+SQL_REPEATED_QUERY_THRESHOLD = int(os.getenv("SQL_REPEATED_QUERY_THRESHOLD", "10"))
+# Statements slower than this (ms) are logged with redacted parameters (0 = off)
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+
+# Longest statement text written to the log
+_MAX_STATEMENT_LENGTH = 500
+
+
+class QueryStats:
+    """Statements executed for one request and the time spent in them."""
+
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        # statement text -> executions, for the repeated statement check
+        self.statements = {}
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def track_queries() -> QueryStats:
+    """Start counting the statements of the current request."""
+    stats = QueryStats()
+    if SQL_STATS_ENABLED:
+        _current.set(stats)
+    return stats
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def server_timing(stats: QueryStats, total_seconds: float) -> str:
+    """`Server-Timing` header value: DB time and statement count, and total time."""
+    return f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", total;dur={total_seconds * 1000:.1f}'
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > _MAX_STATEMENT_LENGTH:
+        return statement[:_MAX_STATEMENT_LENGTH] + "..."
+    return statement
+
+
+def check_queries(stats: QueryStats, route: Optional[str], request_id: str) -> bool:
+    """Warn about a request over the query budget or repeating a statement; True if it was flagged."""
+    flagged = False
+    if SQL_QUERY_BUDGET and stats.queries > SQL_QUERY_BUDGET:
+        logger.warning(
+            "Query budget exceeded: %s issued %s statements (budget %s) - Request: %s",
+            route, stats.queries, SQL_QUERY_BUDGET, request_id,
+        )
+        flagged = True
+    if SQL_REPEATED_QUERY_THRESHOLD and stats.statements:
+        statement, count = max(stats.statements.items(), key=lambda item: item[1])
+        if count >= SQL_REPEATED_QUERY_THRESHOLD:
+            logger.warning(
+                "Repeated statement (possible N+1): %s ran %s times - Request: %s - SQL: %s",
+                route, count, request_id, _shorten(statement),
+            )
+            flagged = True
+    return flagged
+
+
+def redact(parameters):
+    """Statement parameters with every value replaced by its type name."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the shape of the first row is enough
+            return {"rows": len(parameters), "first": redact(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if SQL_SLOW_QUERY_MS or _current.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+
+    stats = _current.get()
+    if stats is not None:
+        stats.db_seconds += elapsed
+        stats.queries += 1
+        if SQL_REPEATED_QUERY_THRESHOLD:
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+    if SQL_SLOW_QUERY_MS and elapsed * 1000 >= SQL_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow statement: %.1f ms - SQL: %s - Parameters: %s",
+            elapsed * 1000, _shorten(statement), redact(parameters),
+        )
+
+
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+
+if SQL_STATS_ENABLED:
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
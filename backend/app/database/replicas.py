@@ -0,0 +1,157 @@
+"""Read-replica routing.
+
+`SessionLocal` produces `RoutingSession`s. A session marked read-only (see
+`get_read_db`) sends its SELECTs to a replica picked round-robin among the
+healthy ones; flushes and INSERT/UPDATE/DELETE statements always go to the
+primary. After a user writes, their reads stay on the primary for
+`DATABASE_REPLICA_STICKY_SECONDS` so they see their own changes even when
+the replicas lag behind.
+
+Health and the read-your-writes window are tracked per worker process.
+Without `DATABASE_REPLICA_URLS` everything runs on the primary.
+"""
+import itertools
+import os
+import threading
+import time
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import Delete, Insert, Update, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.utilis.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds a user's reads stay on the primary after one of their writes
+DATABASE_REPLICA_STICKY_SECONDS = float(os.getenv("DATABASE_REPLICA_STICKY_SECONDS", "5"))
+# Seconds between health checks of a replica
+DATABASE_REPLICA_HEALTH_INTERVAL = float(os.getenv("DATABASE_REPLICA_HEALTH_INTERVAL", "10"))
+# Replicas replaying more than this many seconds behind the primary are skipped (0 = no limit)
+DATABASE_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "30"))
+
+# Replication delay of a standby; NULL on a primary (e.g. the same instance under another URL)
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    """A replica engine and the result of its last health check."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.healthy = True
+        self.checked_at = float("-inf")
+        self._checking = threading.Lock()
+
+    def is_available(self) -> bool:
+        if time.monotonic() - self.checked_at >= DATABASE_REPLICA_HEALTH_INTERVAL:
+            self.check()
+        return self.healthy
+
+    def check(self) -> None:
+        # one thread checks, the others keep using the previous result
+        if not self._checking.acquire(blocking=False):
+            return
+        try:
+            with self.engine.connect() as connection:
+                lag = connection.execute(_LAG_QUERY).scalar()
+            healthy = lag is None or DATABASE_REPLICA_MAX_LAG_SECONDS <= 0 or lag <= DATABASE_REPLICA_MAX_LAG_SECONDS
+            if not healthy:
+                logger.warning(f"Replica {self.engine.url.host} is {lag:.1f}s behind, skipping it")
+        except Exception as e:
+            healthy = False
+            logger.warning(f"Replica {self.engine.url.host} failed its health check: {str(e)}")
+        finally:
+            self.checked_at = time.monotonic()
+            self._checking.release()
+        self.healthy = healthy
+
+
+class ReplicaRouter:
+    """Round-robin over healthy replicas plus the per-user read-your-writes window."""
+
+    def __init__(self, engines: List[Engine]):
+        self.replicas = [Replica(engine) for engine in engines]
+        self._next = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._last_write: dict = {}
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica engine, or None to read from the primary."""
+        if not self.replicas:
+            return None
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = self.replicas[next(self._next)]
+            if replica.is_available():
+                return replica.engine
+        return None
+
+    def record_write(self, user_id: Optional[UUID]) -> None:
+        if not self.replicas or user_id is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_id] = now
+            # forget users whose window is over, keeps the map bounded by recent writers
+            if len(self._last_write) > 10000:
+                self._last_write = {
+                    key: at for key, at in self._last_write.items()
+                    if now - at < DATABASE_REPLICA_STICKY_SECONDS
+                }
+
+    def is_sticky(self, user_id: Optional[UUID]) -> bool:
+        """True while the user's reads must stay on the primary."""
+        if user_id is None:
+            return False
+        last_write = self._last_write.get(user_id)
+        return last_write is not None and time.monotonic() - last_write < DATABASE_REPLICA_STICKY_SECONDS
+
+    def status(self) -> list:
+        return [
+            {"host": replica.engine.url.host, "healthy": replica.healthy}
+            for replica in self.replicas
+        ]
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica when `info["read_only"]` is set.
+
+    `info["user_id"]` (set by the auth dependency) identifies whose writes open
+    the read-your-writes window.
+    """
+
+    def __init__(self, *args, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.router is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        user_id = self.info.get("user_id")
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.router.record_write(user_id)
+        elif self.info.get("read_only") and not self.router.is_sticky(user_id):
+            # keep one replica for the whole request so its reads are consistent
+            if "replica" not in self.info:
+                self.info["replica"] = self.router.choose()
+            if self.info["replica"] is not None:
+                return self.info["replica"]
+
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def fall_back_to_primary(db: Session) -> bool:
+    """Send the remaining reads of a session to the primary.
+
+    Returns True when the session was reading from a replica (so a retry on the
+    primary may find rows the replica has not received yet).
+    """
+    if db.info.get("replica") is None:
+        return False
+    db.info["replica"] = None
+    return True
@@ -1,26 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from app.routers import web
-from app.utilis.logger import setup_logging, get_logger
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.routers import web, web_async
+from app.database.base import DATABASE_ASYNC, engine, async_engine, replica_engines, replica_router
+from app.database.pool import pool_status
+from app.utilis.logger import setup_logging, get_logger, log_queue_status, ACCESS_LOGGER
+from app.utilis.access_log import access_entry, sample_rate
+from app.database.query_stats import SQL_STATS_ENABLED, check_queries, server_timing, track_queries
+from app.utilis.metrics import metrics
+from app.utilis.password_executor import password_executor
 from app.handlers.validation import register_exception_handlers
 import os
 import time
+import uuid
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Setup logging first
 setup_logging()
 logger = get_logger(__name__)
+access_logger = get_logger(ACCESS_LOGGER)
 
 # Load .env from project root (one shared config for backend & frontend)
 env_path = Path(__file__).resolve().parents[2] / '.env'
 load_dotenv(dotenv_path=env_path)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # stop the password worker processes together with the app
+    password_executor.shutdown()
+
 app = FastAPI(
     title=os.getenv("APP_NAME", "Todo FastAPI"),
     description="A FastAPI-based Todo application with authentication",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Register shared exception handlers (validation, etc.)
@@ -35,44 +51,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Request logging middleware - logs all requests like Laravel
+# Access log and metrics middleware: one sampled JSON line per request (see app/utilis/access_log.py),
+# request counters for /metrics (see app/utilis/metrics.py), SQL stats and checks (see app/database/query_stats.py)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Get client IP
-    client_ip = request.client.host if request.client else "Unknown"
-    
-    # Log incoming request
-    logger.info(
-        f"[REQUEST] {request.method} {request.url.path} - "
-        f"IP: {client_ip} - "
-        f"Query: {dict(request.query_params)}"
-    )
+    start_time = time.perf_counter()
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    stats = track_queries()
+    status = 500
+    metrics.request_started()
     
     try:
         response = await call_next(request)
-        process_time = time.time() - start_time
-        
-        # Log successful response
-        logger.info(
-            f"[RESPONSE] {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Time: {process_time:.3f}s - "
-            f"IP: {client_ip}"
-        )
-        
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        if SQL_STATS_ENABLED:
+            response.headers["Server-Timing"] = server_timing(stats, time.perf_counter() - start_time)
         return response
     except Exception as e:
-        process_time = time.time() - start_time
         logger.error(
-            f"[ERROR] {request.method} {request.url.path} - "
-            f"Exception: {str(e)} - "
-            f"Time: {process_time:.3f}s - "
-            f"IP: {client_ip}",
+            "[ERROR] %s %s - Exception: %s - Request: %s",
+            request.method, request.url.path, e, request_id,
             exc_info=True
         )
         raise
+    finally:
+        latency = time.perf_counter() - start_time
+        latency_ms = latency * 1000
+        route = request.scope.get("route")
+        route_name = getattr(route, "name", None)
+        metrics.request_finished(route_name, status, latency, stats)
+        query_warning = SQL_STATS_ENABLED and check_queries(stats, route_name, request_id)
+        entry = access_entry(
+            request_id,
+            request.method,
+            route_name,
+            request.url.path,
+            status,
+            latency_ms,
+            stats,
+            sample_rate(route_name, status, latency_ms, query_warning),
+            query_warning,
+        )
+        if entry is not None:
+            access_logger.info("%s", entry)
 
 # Exception handler for unhandled exceptions
 @app.exception_handler(Exception)
@@ -95,8 +117,65 @@ def read_root():
 def health_check():
     return {"status": "ok", "version": "1.0.0"}
 
-# API v1 routes
-app.include_router(web.router, prefix="/api/v1")
+@app.get("/health/pool")
+def pool_health():
+    """Live connection pool counters (checked out, overflow, checkout wait time)."""
+    pools = {"sync": pool_status(engine)}
+    if DATABASE_ASYNC:
+        pools["async"] = pool_status(async_engine.sync_engine)
+    if replica_engines:
+        pools["replicas"] = [
+            {**replica, **pool_status(replica_engine)}
+            for replica, replica_engine in zip(replica_router.status(), replica_engines)
+        ]
+    return pools
+
+@app.get("/health/logging")
+def logging_health():
+    """Records waiting for the log writer thread and records dropped because its queue was full."""
+    return log_queue_status()
+
+def _pool_gauges():
+    pools = [({"pool": "sync"}, engine)]
+    if DATABASE_ASYNC:
+        pools.append(({"pool": "async"}, async_engine.sync_engine))
+    pools += [
+        ({"pool": "replica", "host": replica["host"]}, replica_engine)
+        for replica, replica_engine in zip(replica_router.status(), replica_engines)
+    ]
+    samples = {}
+    for labels, pool_engine in pools:
+        status = pool_status(pool_engine)
+        for name, key in (
+            ("db_pool_size", "size"),
+            ("db_pool_checked_out", "checked_out"),
+            ("db_pool_overflow", "overflow"),
+            ("db_pool_checkouts_total", "checkouts"),
+            ("db_pool_timeouts_total", "timeouts"),
+            ("db_pool_wait_seconds_total", "wait_seconds_total"),
+        ):
+            if key in status:
+                samples.setdefault(name, []).append((labels, status[key]))
+    return samples
+
+def _password_executor_gauges():
+    stats = password_executor.stats()
+    return {
+        "password_executor_pending": [({}, stats["pending"])],
+        "password_executor_max_pending": [({}, stats["max_pending"])],
+        "password_executor_rejected_total": [({}, stats["rejected"])],
+    }
+
+metrics.add_collector(_pool_gauges)
+metrics.add_collector(_password_executor_gauges)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus metrics of all workers: requests by route/status, latency, DB pool, password executor."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# API v1 routes (async handlers on the asyncpg engine when DATABASE_ASYNC=true)
+app.include_router(web_async.router if DATABASE_ASYNC else web.router, prefix="/api/v1")
 
 logger.info("Application started successfully")
 
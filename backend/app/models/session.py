@@ -1,7 +1,7 @@
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.sql import func
 from app.database.base import Base
@@ -11,7 +11,8 @@ class Session(Base):
 
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=None)
     user_id = Column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), index=True, nullable=False)
-    token = Column(String(255), index=True, nullable=False)
+    # SHA-256 digest of the access token (see app.utilis.auth.hash_token); the raw JWT is never stored
+    token_hash = Column(LargeBinary(32), unique=True, index=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     last_used_at = Column(DateTime(timezone=True), nullable=True, index=True)
@@ -1,19 +1,39 @@
 
-from sqlalchemy import Column, Enum, String, Integer, Boolean, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
-from sqlalchemy.sql import func
+from sqlalchemy import BigInteger, Column, Computed, Enum, String, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, TSVECTOR
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func, text
 from app.database.base import Base
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        # a user's list in order, keyset pagination: WHERE user_id = ? AND (sort_key, id) > (?, ?)
+        Index("ix_todos_user_id_sort_key_id", "user_id", "sort_key", "id"),
+        # index filters by completion/due date within a user's list
+        Index("ix_todos_user_id_is_completed_due_date", "user_id", "is_completed", "due_date"),
+        # today: open todos of a user due within a date range
+        Index("ix_todos_user_id_due_date_open", "user_id", "due_date", postgresql_where=text("is_completed = false")),
+        # search: full-text match over title + description
+        Index("ix_todos_search_vector", "search_vector", postgresql_using="gin"),
+        # a user's titles are unique; also the ON CONFLICT target of TodoController.store
+        Index("uq_todos_user_id_title", "user_id", "title", unique=True),
+    )
 
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=None)
-    order = Column(Integer, default=0)
-    user_id = Column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), index=True, nullable=False)
-    title = Column(String(255), index=True, nullable=False)
+    # sparse ordering key (see app/utilis/todo_order.py); the API's 1-based `order`
+    # position is computed at read time and set on the instance by the controllers
+    sort_key = Column(BigInteger, nullable=False, default=0)
+    user_id = Column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    title = Column(String(255), nullable=False)
     description = Column(String(500), nullable=True)
-    is_completed = Column(Boolean, default=False, index=True)
-    due_date = Column(DateTime(timezone=True), nullable=True, index=True)
-    priority =Column(Enum("low", "medium", "high", name="todo_priority"), default="low", index=True)
+    is_completed = Column(Boolean, default=False)
+    due_date = Column(DateTime(timezone=True), nullable=True)
+    priority =Column(Enum("low", "medium", "high", name="todo_priority"), default="low")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # maintained by Postgres; deferred so list queries don't load it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))", persisted=True),
+    ))
\ No newline at end of file
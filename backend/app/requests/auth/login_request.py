@@ -1,5 +1,4 @@
 from app.database.db_helper import get_db_session
-from app.utilis.auth import verify_password
 from pydantic import BaseModel, Field, field_validator, ValidationInfo
 from app.models.user import User
 from app.utilis.validation_messages import required, min_length, max_length
@@ -32,14 +31,7 @@ class LoginRequest(BaseModel):
             raise ValueError(min_length("password", 8))
         if len(v) > 72:
             raise ValueError(max_length("password", 72))
-        with get_db_session() as session:
-            if 'email' not in info.data:
-                raise ValueError(required("email"))
-            user = session.query(User).filter(User.email == info.data['email']).first()
-            if not user:
-                raise ValueError("email or password are incorrect")
-            if not verify_password(v, user.hashed_password):  # Use 'v' instead of values['password']
-                raise ValueError("email or password are incorrect")
+        # the password itself is verified once, in AuthController.login, off the event loop
         return v
         
     class Config:
@@ -0,0 +1,29 @@
+from typing import List
+from pydantic import BaseModel, Field, field_validator
+from app.requests.todo.todo_create_request import TodoCreateRequest
+from app.utilis.validation_messages import required, at_most
+
+# Largest batch accepted by one bulk create request (one multi-row INSERT)
+MAX_BULK_TODOS = 500
+
+class TodoBulkCreateRequest(BaseModel):
+    # every item is validated like a single create; one invalid item rejects the batch
+    todos: List[TodoCreateRequest] = Field(..., description="Todos to create, in list order")
+
+    @field_validator("todos")
+    def validate_todos(cls, v: List[TodoCreateRequest]) -> List[TodoCreateRequest]:
+        if not v:
+            raise ValueError(required("todos"))
+        if len(v) > MAX_BULK_TODOS:
+            raise ValueError(at_most("todos", MAX_BULK_TODOS))
+        return v
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "todos": [
+                    {"title": "First todo", "priority": "low"},
+                    {"title": "Second todo", "description": "Todo description", "priority": "high"},
+                ]
+            }
+        }
@@ -0,0 +1,62 @@
+from typing import List, Literal, Optional
+import uuid
+from pydantic import BaseModel, Field, field_validator, model_validator
+from app.utilis.validation_messages import required, at_most, max_length
+
+# Largest id list accepted by one bulk update request
+MAX_BULK_IDS = 500
+
+class TodoBulkFilter(BaseModel):
+    # same filters as TodoIndexRequest; omitted ones match every todo
+    search: Optional[str] = None
+    completed: Optional[bool] = None
+    due_date: Optional[str] = None
+    priority: Optional[Literal["low", "medium", "high"]] = None
+
+    @field_validator("search")
+    def validate_search(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and len(v) > 255:
+            raise ValueError(max_length("search", 255))
+        return v
+
+class TodoBulkUpdateRequest(BaseModel):
+    operation: Literal["complete", "uncomplete", "delete", "priority"] = Field(..., description="Change applied to every selected todo")
+    # select todos either by id or by filter
+    ids: Optional[List[uuid.UUID]] = Field(None, description="Ids of the todos")
+    filter: Optional[TodoBulkFilter] = Field(None, description="Filter selecting the todos")
+    # new priority, for the "priority" operation
+    priority: Optional[Literal["low", "medium", "high"]] = Field(None, description="Priority to set")
+    # a delete by an empty filter removes the whole list: it must be asked for explicitly
+    select_all: bool = Field(False, description="Confirm a delete matching every todo (empty filter)")
+
+    @field_validator("ids")
+    def validate_ids(cls, v: Optional[List[uuid.UUID]]) -> Optional[List[uuid.UUID]]:
+        if v is not None:
+            if not v:
+                raise ValueError(required("ids"))
+            if len(v) > MAX_BULK_IDS:
+                raise ValueError(at_most("ids", MAX_BULK_IDS))
+        return v
+
+    @model_validator(mode="after")
+    def validate_selection(self) -> "TodoBulkUpdateRequest":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Either ids or filter is required")
+        if self.operation == "priority" and self.priority is None:
+            raise ValueError(required("priority"))
+        if (
+            self.operation == "delete"
+            and self.filter is not None
+            and not self.filter.model_dump(exclude_none=True)
+            and not self.select_all
+        ):
+            raise ValueError("Deleting every todo requires select_all")
+        return self
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "operation": "complete",
+                "ids": ["3fa85f64-5717-4562-b3fc-2c963f66afa6"],
+            }
+        }
@@ -1,11 +1,16 @@
-from pydantic import BaseModel, Field, field_validator
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from typing import Optional, Literal
 import uuid
-from app.utilis.validation_messages import greater_than, at_most, max_length
+from app.utilis.validation_messages import greater_than, at_most, max_length, invalid
+from app.utilis.paginator import decode_cursor
+from app.utilis.todo_order import SORT_KEY_MIN, SORT_KEY_MAX
 
 class TodoIndexRequest(BaseModel):
     page: Optional[int] = 1
     page_size: Optional[int] = 20
+    # opaque keyset cursor (`next_cursor` of a previous response); when given, `page` is ignored
+    cursor: Optional[str] = None
     search: Optional[str] = None
     completed: Optional[bool] = None
     due_date: Optional[str] = None
@@ -29,6 +34,21 @@ class TodoIndexRequest(BaseModel):
                 raise ValueError(at_most("page_size", 100))
         return v
 
+    @field_validator("cursor")
+    def validate_cursor(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None:
+            try:
+                # [sort_key, id] or [sort_key, id, position]
+                order, todo_id, *position = decode_cursor(v)
+                if not SORT_KEY_MIN <= int(order) <= SORT_KEY_MAX:
+                    raise ValueError("Invalid cursor")
+                uuid.UUID(str(todo_id))
+                if len(position) > 1 or (position and int(position[0]) < 0):
+                    raise ValueError("Invalid cursor")
+            except (ValueError, TypeError):
+                raise ValueError(invalid("cursor"))
+        return v
+
     @field_validator("search")
     def validate_search(cls, v: Optional[str]) -> Optional[str]:
         if v is not None and len(v) > 255:
@@ -45,4 +65,29 @@ class TodoIndexRequest(BaseModel):
                 "due_date": "2022-01-01",
                 "priority": "low"
             }
-        }
\ No newline at end of file
+        }
+
+
+def todo_index_request(
+    page: Optional[int] = 1,
+    page_size: Optional[int] = 20,
+    cursor: Optional[str] = None,
+    search: Optional[str] = None,
+    completed: Optional[bool] = None,
+    due_date: Optional[str] = None,
+    priority: Optional[Literal["low", "medium", "high"]] = None,
+) -> TodoIndexRequest:
+    """Query parameters of GET /todos as a TodoIndexRequest.
+
+    The model's validators raise a plain pydantic ValidationError; turn it into
+    a RequestValidationError here so only these query errors answer 422.
+    """
+    try:
+        return TodoIndexRequest(
+            page=page, page_size=page_size, cursor=cursor, search=search,
+            completed=completed, due_date=due_date, priority=priority,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("query", *error["loc"])} for error in e.errors()]
+        )
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+class UserResponse(BaseModel):
+    id: str
+    name: str
+    surname: str
+    email: str
+
+class AuthResponse(BaseModel):
+    # login and register
+    access_token: str
+    type: str
+    user: UserResponse
+
+class LogoutResponse(BaseModel):
+    message: str
+    user_id: str
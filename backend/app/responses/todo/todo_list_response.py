@@ -0,0 +1,11 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from app.responses.todo.todo_response import TodoItem
+
+class TodoListResponse(BaseModel):
+    items: List[TodoItem]
+    # page and total are left out in keyset (cursor) mode, next_cursor by today
+    page: Optional[int] = None
+    page_size: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
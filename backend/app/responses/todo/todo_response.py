@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+import uuid
+from pydantic import BaseModel, field_serializer
+
+class TodoItem(BaseModel):
+    # the fields the client renders, in single-todo responses and list items
+    id: uuid.UUID
+    order: Optional[int]
+    title: str
+    description: Optional[str] = None
+    is_completed: Optional[bool] = None
+    due_date: Optional[datetime] = None
+    priority: Optional[Literal["low", "medium", "high"]] = None
+
+    @field_serializer("due_date")
+    def serialize_due_date(self, v: Optional[datetime]) -> Optional[str]:
+        # "+00:00" like datetime.isoformat(), not pydantic's "Z"
+        return v.isoformat() if v is not None else None
+
+class TodoResponse(BaseModel):
+    # store, update, order and completed updates, destroy
+    message: str
+    todo: TodoItem
+
+class TodoBulkStoreResult(BaseModel):
+    index: int
+    status: int
+    # `todo` when created (200), `detail` otherwise
+    todo: Optional[TodoItem] = None
+    detail: Optional[str] = None
+
+class TodoBulkStoreResponse(BaseModel):
+    message: str
+    created: int
+    results: List[TodoBulkStoreResult]
+
+class TodoBulkUpdateResponse(BaseModel):
+    message: str
+    operation: str
+    affected: int
@@ -2,6 +2,8 @@ from app.controllers.todo_controller import TodoController
 from app.requests.auth.register_request import RegisterRequest
 from app.requests.auth.login_request import LoginRequest
 from app.requests.todo.todo_create_request import TodoCreateRequest
+from app.requests.todo.todo_bulk_create_request import TodoBulkCreateRequest
+from app.requests.todo.todo_bulk_update_request import TodoBulkUpdateRequest
 from app.requests.todo.todo_update_request import TodoUpdateRequest
 from app.utilis.auth import get_current_user, get_current_session
 from app.models.user import User
@@ -9,69 +11,82 @@ from app.models.session import Session as SessionModel
 from fastapi import APIRouter, Depends, Body
 from sqlalchemy.orm import Session
 from app.controllers.auth_controller import AuthController
-from app.database.base import get_db
+from app.database.base import get_db, get_read_db
 from app.controllers.profile_controller import ProfileController
 from app.requests.profile.profile_update_request import ProfileUpdateRequest
 from app.requests.profile.profile_password_update_request import ProfilePasswordUpdateRequest
 from app.requests.todo.todo_update_request import TodoUpdateRequest
-from app.requests.todo.todo_index_request import TodoIndexRequest
+from app.requests.todo.todo_index_request import TodoIndexRequest, todo_index_request
+from app.responses.todo.todo_list_response import TodoListResponse
+from app.responses.todo.todo_response import TodoResponse, TodoBulkStoreResponse, TodoBulkUpdateResponse
+from app.responses.auth.auth_response import AuthResponse, LogoutResponse, UserResponse
+from app.responses.message_response import MessageResponse
 from typing import Optional
 import uuid
 
 router = APIRouter()
 
 # Auth endpoints
-@router.post("/auth/login", name="v1-auth-login")
+@router.post("/auth/login", name="v1-auth-login", response_model=AuthResponse)
 def login(request: LoginRequest, db: Session = Depends(get_db)):
     return AuthController.login(db, request.email, request.password)
 
-@router.post('/auth/register', name="v1-auth-register")
+@router.post('/auth/register', name="v1-auth-register", response_model=AuthResponse)
 def register(request: RegisterRequest, db: Session = Depends(get_db)):
     return AuthController.register(db, request.name,  request.surname, request.email, request.password, request.password_confirm)
 
-@router.delete('/auth/logout', name="v1-auth-logout")
+@router.delete('/auth/logout', name="v1-auth-logout", response_model=LogoutResponse)
 def logout(current_user: User = Depends(get_current_user), current_session: SessionModel = Depends(get_current_session), db: Session = Depends(get_db)):
     return AuthController.logout(db, current_user, current_session)
 
 #profile
-@router.get("/auth/me", name="v1-auth-me")
-def get_me(current_user: User = Depends(get_current_user)):
+@router.get("/auth/me", name="v1-auth-me", response_model=UserResponse)
+def get_me(db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     return ProfileController.get_me(current_user)
 
-@router.put("/profile/update", name="v1-profile-update")
+@router.put("/profile/update", name="v1-profile-update", response_model=MessageResponse)
 def update_profile(request: ProfileUpdateRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     return ProfileController.update(current_user, request.name, request.surname, request.email, db)
 
-@router.put("/profile/password/update", name="v1-profile-password-update")
+@router.put("/profile/password/update", name="v1-profile-password-update", response_model=MessageResponse)
 def update_password(request: ProfilePasswordUpdateRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     return ProfileController.update_password(current_user, request.old_password, request.password, request.password_confirm, db)
 
 #todos
-@router.get("/todos", name="v1-todos")
-def index(request: TodoIndexRequest =  Depends(), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return TodoController.index(current_user, db, request.page, request.page_size, request.search, request.completed, request.due_date, request.priority)
+@router.get("/todos", name="v1-todos", response_model=TodoListResponse, response_model_exclude_unset=True)
+def index(request: TodoIndexRequest = Depends(todo_index_request), db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
+    return TodoController.index(current_user, db, request.page, request.page_size, request.search, request.completed, request.due_date, request.priority, request.cursor)
 
-@router.get("/todos/today", name="v1-todos-today")
-def today(priority: Optional[str] = None, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get("/todos/today", name="v1-todos-today", response_model=TodoListResponse, response_model_exclude_unset=True)
+def today(priority: Optional[str] = None, db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     return TodoController.today(current_user, db, priority)
 
-@router.post("/todo/create", name="v1-todo-store")
+@router.post("/todo/create", name="v1-todo-store", response_model=TodoResponse)
 def store(request: TodoCreateRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     return TodoController.store(current_user, db, request.title, request.description, request.priority, request.due_date)
 
-@router.put("/todo/update/{id}", name="v1-todo-update")
+@router.post("/todo/bulk-create", name="v1-todo-bulk-store", response_model=TodoBulkStoreResponse, response_model_exclude_unset=True)
+def bulk_store(request: TodoBulkCreateRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return TodoController.bulk_store(current_user, db, [todo.model_dump() for todo in request.todos])
+
+@router.post("/todo/bulk-update", name="v1-todo-bulk-update", response_model=TodoBulkUpdateResponse)
+def bulk_update(request: TodoBulkUpdateRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    filters = request.filter.model_dump() if request.filter else None
+    return TodoController.bulk_update(current_user, db, request.operation, request.ids, filters, request.priority)
+
+@router.put("/todo/update/{id}", name="v1-todo-update", response_model=TodoResponse)
 def update(id: uuid.UUID, request: TodoUpdateRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     return TodoController.update(current_user, db, id, request.title, request.description, request.priority, request.due_date)
 
-@router.delete("/todo/delete/{id}", name="v1-todo-destroy")
+@router.delete("/todo/delete/{id}", name="v1-todo-destroy", response_model=TodoResponse)
 def destroy(id: uuid.UUID, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     return TodoController.destroy(current_user, db, id)
 
-@router.put("/todo/order-update/{id}", name="v1-todo-order-update")
+@router.put("/todo/order-update/{id}", name="v1-todo-order-update", response_model=TodoResponse)
 def update_order(id: uuid.UUID, order: int = Body(...,embed=True), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     return TodoController.update_order(current_user, db, id, order)
 
-@router.put("/todo/completed/{id}", name="v1-todo-completed-update")
+@router.put("/todo/completed/{id}", name="v1-todo-completed-update", response_model=TodoResponse)
 def update_completed(id: uuid.UUID, is_completed: bool = Body(...,embed=True), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     return TodoController.update_completed(current_user, db, id, is_completed)
     
\ No newline at end of file
@@ -0,0 +1,93 @@
+from app.controllers.async_todo_controller import AsyncTodoController
+from app.controllers.async_auth_controller import AsyncAuthController
+from app.controllers.async_profile_controller import AsyncProfileController
+from app.controllers.profile_controller import ProfileController
+from app.requests.auth.register_request import RegisterRequest
+from app.requests.auth.login_request import LoginRequest
+from app.requests.todo.todo_create_request import TodoCreateRequest
+from app.requests.todo.todo_bulk_create_request import TodoBulkCreateRequest
+from app.requests.todo.todo_bulk_update_request import TodoBulkUpdateRequest
+from app.requests.todo.todo_update_request import TodoUpdateRequest
+from app.requests.todo.todo_index_request import TodoIndexRequest, todo_index_request
+from app.responses.todo.todo_list_response import TodoListResponse
+from app.responses.todo.todo_response import TodoResponse, TodoBulkStoreResponse, TodoBulkUpdateResponse
+from app.responses.auth.auth_response import AuthResponse, LogoutResponse, UserResponse
+from app.responses.message_response import MessageResponse
+from app.requests.profile.profile_update_request import ProfileUpdateRequest
+from app.requests.profile.profile_password_update_request import ProfilePasswordUpdateRequest
+from app.utilis.async_auth import get_current_user_async, get_current_session_async
+from app.models.user import User
+from app.models.session import Session as SessionModel
+from fastapi import APIRouter, Depends, Body
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.base import get_async_db
+from typing import Optional
+import uuid
+
+# Same endpoints as `web.router`, served by async handlers on the asyncpg engine.
+# Request validators still run their (sync) lookups through `get_db_session`.
+router = APIRouter()
+
+# Auth endpoints
+@router.post("/auth/login", name="v1-auth-login", response_model=AuthResponse)
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    return await AsyncAuthController.login(db, request.email, request.password)
+
+@router.post('/auth/register', name="v1-auth-register", response_model=AuthResponse)
+async def register(request: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
+    return await AsyncAuthController.register(db, request.name, request.surname, request.email, request.password, request.password_confirm)
+
+@router.delete('/auth/logout', name="v1-auth-logout", response_model=LogoutResponse)
+async def logout(current_user: User = Depends(get_current_user_async), current_session: SessionModel = Depends(get_current_session_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncAuthController.logout(db, current_user, current_session)
+
+#profile
+@router.get("/auth/me", name="v1-auth-me", response_model=UserResponse)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+    return ProfileController.get_me(current_user)
+
+@router.put("/profile/update", name="v1-profile-update", response_model=MessageResponse)
+async def update_profile(request: ProfileUpdateRequest, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncProfileController.update(current_user, request.name, request.surname, request.email, db)
+
+@router.put("/profile/password/update", name="v1-profile-password-update", response_model=MessageResponse)
+async def update_password(request: ProfilePasswordUpdateRequest, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncProfileController.update_password(current_user, request.old_password, request.password, request.password_confirm, db)
+
+#todos
+@router.get("/todos", name="v1-todos", response_model=TodoListResponse, response_model_exclude_unset=True)
+async def index(request: TodoIndexRequest = Depends(todo_index_request), current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTodoController.index(current_user, db, request.page, request.page_size, request.search, request.completed, request.due_date, request.priority, request.cursor)
+
+@router.get("/todos/today", name="v1-todos-today", response_model=TodoListResponse, response_model_exclude_unset=True)
+async def today(priority: Optional[str] = None, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTodoController.today(current_user, db, priority)
+
+@router.post("/todo/create", name="v1-todo-store", response_model=TodoResponse)
+async def store(request: TodoCreateRequest, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTodoController.store(current_user, db, request.title, request.description, request.priority, request.due_date)
+
+@router.post("/todo/bulk-create", name="v1-todo-bulk-store", response_model=TodoBulkStoreResponse, response_model_exclude_unset=True)
+async def bulk_store(request: TodoBulkCreateRequest, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTodoController.bulk_store(current_user, db, [todo.model_dump() for todo in request.todos])
+
+@router.post("/todo/bulk-update", name="v1-todo-bulk-update", response_model=TodoBulkUpdateResponse)
+async def bulk_update(request: TodoBulkUpdateRequest, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    filters = request.filter.model_dump() if request.filter else None
+    return await AsyncTodoController.bulk_update(current_user, db, request.operation, request.ids, filters, request.priority)
+
+@router.put("/todo/update/{id}", name="v1-todo-update", response_model=TodoResponse)
+async def update(id: uuid.UUID, request: TodoUpdateRequest, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTodoController.update(current_user, db, id, request.title, request.description, request.priority, request.due_date)
+
+@router.delete("/todo/delete/{id}", name="v1-todo-destroy", response_model=TodoResponse)
+async def destroy(id: uuid.UUID, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTodoController.destroy(current_user, db, id)
+
+@router.put("/todo/order-update/{id}", name="v1-todo-order-update", response_model=TodoResponse)
+async def update_order(id: uuid.UUID, order: int = Body(...,embed=True), current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTodoController.update_order(current_user, db, id, order)
+
+@router.put("/todo/completed/{id}", name="v1-todo-completed-update", response_model=TodoResponse)
+async def update_completed(id: uuid.UUID, is_completed: bool = Body(...,embed=True), current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTodoController.update_completed(current_user, db, id, is_completed)
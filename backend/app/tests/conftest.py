@@ -1,12 +1,14 @@
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from app.main import app
 from app.database.base import Base, get_db
 from app.models.user import User
 from app.models.session import Session as SessionModel
 from app.utilis.auth import get_password_hash
+from app.utilis import auth_cache
 from app.database.faker import fake_user_data as faker_fake_user_data, fake_todo_data as faker_fake_todo_data, make_session
 from uuid import uuid4
 import os
@@ -100,6 +102,30 @@ def client(db_session: Session):
     # Limpar override após o teste
     app.dependency_overrides.clear()
 
+    # Sessões em cache apontam para linhas revertidas pelo rollback
+    auth_cache.clear()
+
+
+@pytest.fixture
+def captured_statements(db_session: Session):
+    """
+    Context manager que coleta o SQL executado dentro do bloco.
+    Uso: `with captured_statements() as statements: client.get(...)`
+    """
+    engine = db_session.get_bind().engine
+
+    @contextmanager
+    def capture():
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+    return capture
+
 
 @pytest.fixture
 def fake_user_data():
@@ -49,4 +49,14 @@ class Testlogin:
         assert doUserLogout.status_code == 200
         
 
-        
\ No newline at end of file
+        
+    def test_login_rejected_when_password_executor_saturated(self, client: TestClient, db_session: Session, test_user, fake_user_data: dict, monkeypatch):
+        '''Test login answers 503 instead of queueing when password work is saturated'''
+        from app.utilis.password_executor import password_executor
+
+        monkeypatch.setattr(password_executor, "max_pending", 0)
+
+        loginUrl = client.app.url_path_for("v1-auth-login")
+        doUserLogin = client.post(loginUrl, json={"email": test_user.email, "password": fake_user_data["password"]})
+        assert doUserLogin.status_code == 503
+        assert doUserLogin.headers["retry-after"] == "1"
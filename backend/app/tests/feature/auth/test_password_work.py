@@ -0,0 +1,71 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.main import app
+from app.utilis import password_executor as password_module
+
+class Testpassword_work:
+    '''Tests that each endpoint performs the minimum number of bcrypt operations'''
+
+    @pytest.fixture
+    def bcrypt_calls(self, monkeypatch):
+        '''count bcrypt hash/check calls (password work runs inline so calls are visible)'''
+        calls = {"hashpw": 0, "checkpw": 0}
+        hashpw, checkpw = password_module.bcrypt.hashpw, password_module.bcrypt.checkpw
+
+        def counting_hashpw(*args):
+            calls["hashpw"] += 1
+            return hashpw(*args)
+
+        def counting_checkpw(*args):
+            calls["checkpw"] += 1
+            return checkpw(*args)
+
+        monkeypatch.setattr(password_module.password_executor, "kind", "inline")
+        monkeypatch.setattr(password_module.bcrypt, "hashpw", counting_hashpw)
+        monkeypatch.setattr(password_module.bcrypt, "checkpw", counting_checkpw)
+        return calls
+
+    def test_register_hashes_once(self, client: TestClient, db_session: Session, fake_user_data: dict, bcrypt_calls):
+        '''register hashes the password and issues the session without verifying it again'''
+
+        response = client.post(client.app.url_path_for("v1-auth-register"), json=fake_user_data)
+        assert response.status_code == 200
+        assert response.json()["access_token"]
+        assert bcrypt_calls == {"hashpw": 1, "checkpw": 0}
+
+    def test_login_checks_once(self, client: TestClient, db_session: Session, test_user, fake_user_data: dict, bcrypt_calls):
+        '''login verifies the password exactly once'''
+
+        response = client.post(client.app.url_path_for("v1-auth-login"), json={"email": test_user.email, "password": fake_user_data["password"]})
+        assert response.status_code == 200
+        assert bcrypt_calls == {"hashpw": 0, "checkpw": 1}
+
+    def test_login_wrong_password(self, client: TestClient, db_session: Session, test_user, bcrypt_calls):
+        '''a wrong password is reported as a validation error after a single check'''
+
+        response = client.post(client.app.url_path_for("v1-auth-login"), json={"email": test_user.email, "password": "WrongPassword123!"})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["msg"] == "email or password are incorrect"
+        assert bcrypt_calls == {"hashpw": 0, "checkpw": 1}
+
+    def test_password_update_checks_once_and_hashes_once(self, authenticated_client, fake_user_data: dict, bcrypt_calls):
+        '''password update verifies the old password once and hashes the new one once'''
+
+        client, token, user = authenticated_client
+        response = client.put(client.app.url_path_for("v1-profile-password-update"), json={
+            "old_password": fake_user_data["password"],
+            "password": "NewPassword123!",
+            "password_confirm": "NewPassword123!",
+        })
+        assert response.status_code == 200
+        assert bcrypt_calls == {"hashpw": 1, "checkpw": 1}
+
+    def test_app_shutdown_stops_the_pool(self, db_session: Session):
+        '''the password pool is shut down with the app and created again on next use'''
+
+        with TestClient(app):
+            password_module.password_executor.run(password_module.bcrypt_hash, "secret")
+            assert password_module.password_executor._executor is not None
+
+        assert password_module.password_executor._executor is None
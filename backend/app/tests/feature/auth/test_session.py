@@ -0,0 +1,143 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from app.database.faker import make_session
+from app.models.session import Session as SessionModel
+from app.controllers.auth_controller import AuthController
+from app.controllers.profile_controller import ProfileController
+from app.utilis import auth_cache
+from app.utilis.auth import create_access_token
+
+class Testsession:
+    '''Tests for session validation'''
+
+    def _login_with_session(self, client: TestClient, db_session: Session, user, last_used_at: datetime) -> SessionModel:
+        token = create_access_token(data={"sub": str(user.id)})
+        session = make_session(user_id=user.id, token=token, last_used_at=last_used_at)
+        db_session.add(session)
+        db_session.flush()
+        client.headers.update({"Authorization": f"Bearer {token}"})
+        return session
+
+    def test_recently_used_session_is_not_touched(self, client: TestClient, db_session: Session, test_user):
+        '''a request within the touch interval does not rewrite last_used_at'''
+
+        last_used_at = datetime.utcnow() - timedelta(seconds=30)
+        session = self._login_with_session(client, db_session, test_user, last_used_at)
+
+        response = client.get(client.app.url_path_for("v1-auth-me"))
+        assert response.status_code == 200
+
+        db_session.refresh(session)
+        assert session.last_used_at.replace(tzinfo=None) == last_used_at
+
+    def test_stale_session_is_touched(self, client: TestClient, db_session: Session, test_user):
+        '''a request after the touch interval refreshes last_used_at'''
+
+        last_used_at = datetime.utcnow() - timedelta(hours=1)
+        session = self._login_with_session(client, db_session, test_user, last_used_at)
+
+        response = client.get(client.app.url_path_for("v1-auth-me"))
+        assert response.status_code == 200
+
+        db_session.refresh(session)
+        assert session.last_used_at.replace(tzinfo=None) > last_used_at + timedelta(minutes=59)
+
+    def test_expired_session_is_rejected(self, client: TestClient, db_session: Session, test_user):
+        '''a session unused for SESSION_EXPIRE_DAYS is rejected'''
+
+        self._login_with_session(client, db_session, test_user, datetime.utcnow() - timedelta(days=8))
+
+        response = client.get(client.app.url_path_for("v1-auth-me"))
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Session has expired"
+
+    def test_cached_session_authenticates_without_queries(self, client: TestClient, db_session: Session, test_user, captured_statements):
+        '''a second request with the same token is resolved from the auth cache'''
+
+        self._login_with_session(client, db_session, test_user, datetime.utcnow())
+        me_url = client.app.url_path_for("v1-auth-me")
+        assert client.get(me_url).status_code == 200
+
+        with captured_statements() as statements:
+            response = client.get(me_url)
+
+        assert response.status_code == 200
+        assert response.json()["email"] == test_user.email
+        assert statements == []
+
+    def test_logout_invalidates_cached_session(self, client: TestClient, db_session: Session, test_user):
+        '''a token cannot be used after logout even if it was cached'''
+
+        self._login_with_session(client, db_session, test_user, datetime.utcnow())
+        assert client.get(client.app.url_path_for("v1-auth-me")).status_code == 200
+
+        assert client.delete(client.app.url_path_for("v1-auth-logout")).status_code == 200
+
+        response = client.get(client.app.url_path_for("v1-auth-me"))
+        assert response.status_code == 401
+
+    def test_cached_session_deleted_elsewhere_is_rejected(self, client: TestClient, db_session: Session, test_user):
+        '''a cached token whose session row is gone (logout on another worker) gets 401, not 500'''
+
+        session = self._login_with_session(client, db_session, test_user, datetime.utcnow())
+        me_url = client.app.url_path_for("v1-auth-me")
+        assert client.get(me_url).status_code == 200
+
+        # another worker deletes the row; this worker's cache still holds it, with a touch due
+        token_hash = session.token_hash
+        db_session.execute(delete(SessionModel).where(SessionModel.id == session.id))
+        db_session.expunge_all()
+        auth_cache.touch_session(token_hash, datetime.utcnow() - timedelta(hours=1))
+
+        response = client.get(me_url)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Session not found"
+        assert auth_cache.get(db_session, token_hash) is None
+
+    def test_logout_drops_a_token_cached_again_before_commit(self, client: TestClient, db_session: Session, test_user):
+        '''a concurrent request re-caching the session between logout's flush and the commit does not keep it'''
+
+        session = self._login_with_session(client, db_session, test_user, datetime.utcnow())
+        token_hash = session.token_hash
+        AuthController.logout(db_session, test_user, session)
+
+        # a request that read the still-committed row stores it again
+        auth_cache.store(token_hash, session, test_user)
+        assert auth_cache.get(db_session, token_hash) is not None
+        db_session.expunge_all()
+
+        db_session.commit()
+
+        assert auth_cache.get(db_session, token_hash) is None
+
+    def test_profile_update_drops_a_user_cached_again_before_commit(self, client: TestClient, db_session: Session, test_user):
+        '''a user re-cached between a profile update's flush and the commit is dropped on commit'''
+
+        session = self._login_with_session(client, db_session, test_user, datetime.utcnow())
+        token_hash = session.token_hash
+        ProfileController.update(test_user, "Renamed", test_user.surname, test_user.email, db_session)
+
+        auth_cache.store(token_hash, session, test_user)
+        db_session.commit()
+
+        assert auth_cache.get(db_session, token_hash) is None
+
+    def test_profile_update_invalidates_cached_user(self, client: TestClient, db_session: Session, test_user):
+        '''profile changes are visible on the next request'''
+
+        self._login_with_session(client, db_session, test_user, datetime.utcnow())
+        assert client.get(client.app.url_path_for("v1-auth-me")).status_code == 200
+
+        response = client.put(client.app.url_path_for("v1-profile-update"), json={
+            "name": "Renamed",
+            "surname": test_user.surname,
+            "email": test_user.email,
+        })
+        assert response.status_code == 200
+
+        response = client.get(client.app.url_path_for("v1-auth-me"))
+        assert response.status_code == 200
+        assert response.json()["name"] == "Renamed"
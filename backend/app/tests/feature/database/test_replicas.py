@@ -0,0 +1,120 @@
+import pytest
+from uuid import uuid4
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.database import replicas as replicas_module
+from app.database.replicas import ReplicaRouter, RoutingSession, fall_back_to_primary
+from app.models.user import User
+from app.tests.conftest import TEST_DATABASE_URL
+
+APPLICATION_NAME = text("SELECT current_setting('application_name')")
+
+class Testreplicas:
+    '''Tests for read-replica routing (replicas are the test database under other URLs)'''
+
+    def _engine(self, name: str):
+        separator = "&" if "?" in TEST_DATABASE_URL else "?"
+        return create_engine(f"{TEST_DATABASE_URL}{separator}application_name={name}")
+
+    @pytest.fixture
+    def engines(self):
+        '''primary and two replicas, told apart by their application_name'''
+        engines = {name: self._engine(name) for name in ["primary", "replica_a", "replica_b"]}
+        yield engines
+        for engine in engines.values():
+            engine.dispose()
+
+    def _session(self, engines: dict, router: ReplicaRouter, read_only: bool = True):
+        session = sessionmaker(class_=RoutingSession, router=router, bind=engines["primary"])()
+        session.info["read_only"] = read_only
+        session.info["user_id"] = uuid4()
+        return session
+
+    def test_reads_round_robin_over_replicas(self, engines: dict):
+        '''Testing that read-only sessions use the replicas in turn, other sessions the primary'''
+
+        # Arrange
+        router = ReplicaRouter([engines["replica_a"], engines["replica_b"]])
+
+        # Act
+        names = []
+        for read_only in [True, True, True, False]:
+            with self._session(engines, router, read_only) as session:
+                names.append(session.execute(APPLICATION_NAME).scalar())
+
+        # Assert
+        assert names == ["replica_a", "replica_b", "replica_a", "primary"]
+
+    def test_writes_go_to_primary_and_keep_user_reads_there(self, engines: dict):
+        '''Testing read-your-writes: after a flush the user's reads stay on the primary'''
+
+        # Arrange
+        router = ReplicaRouter([engines["replica_a"]])
+        session = self._session(engines, router)
+        user_id = session.info["user_id"]
+
+        try:
+            assert session.execute(APPLICATION_NAME).scalar() == "replica_a"
+
+            # Act - the write itself is sent to the primary
+            session.add(User(id=uuid4(), name="a", surname="b", email=f"{uuid4()}@example.com", hashed_password="x"))
+            session.flush()
+
+            # Assert
+            assert router.is_sticky(user_id)
+            assert session.execute(APPLICATION_NAME).scalar() == "primary"
+        finally:
+            session.rollback()
+            session.close()
+
+        # another request of the same user also reads from the primary
+        with self._session(engines, router) as other:
+            other.info["user_id"] = user_id
+            assert other.execute(APPLICATION_NAME).scalar() == "primary"
+
+    def test_unhealthy_replica_is_skipped(self, engines: dict):
+        '''Testing that a replica failing its health check is not used'''
+
+        # Arrange
+        broken = create_engine("postgresql+psycopg2://nobody@/missing?host=/nonexistent")
+        router = ReplicaRouter([broken, engines["replica_a"]])
+
+        # Act
+        with self._session(engines, router) as first, self._session(engines, router) as second:
+            names = [first.execute(APPLICATION_NAME).scalar(), second.execute(APPLICATION_NAME).scalar()]
+
+        # Assert
+        assert names == ["replica_a", "replica_a"]
+        assert [replica["healthy"] for replica in router.status()] == [False, True]
+        broken.dispose()
+
+    def test_lagging_replica_is_skipped(self, engines: dict, monkeypatch):
+        '''Testing that replicas behind by more than the allowed lag fall back to the primary'''
+
+        # Arrange
+        monkeypatch.setattr(replicas_module, "_LAG_QUERY", text("SELECT 120.0"))
+        router = ReplicaRouter([engines["replica_a"]])
+
+        # Act
+        with self._session(engines, router) as session:
+            name = session.execute(APPLICATION_NAME).scalar()
+
+        # Assert
+        assert name == "primary"
+
+    def test_fall_back_to_primary(self, engines: dict):
+        '''Testing that a session reading from a replica can be switched to the primary'''
+
+        # Arrange
+        router = ReplicaRouter([engines["replica_a"]])
+
+        with self._session(engines, router) as session:
+            assert session.execute(APPLICATION_NAME).scalar() == "replica_a"
+
+            # Act
+            switched = fall_back_to_primary(session)
+
+            # Assert
+            assert switched is True
+            assert session.execute(APPLICATION_NAME).scalar() == "primary"
+            assert fall_back_to_primary(session) is False
@@ -0,0 +1,70 @@
+import json
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from app.utilis import access_log
+from app.utilis.access_log import sample_rate
+from app.utilis.logger import ACCESS_LOGGER
+
+class Testaccess_log:
+    '''Tests for the structured, sampled access log'''
+
+    def _entries(self, caplog) -> list:
+        return [json.loads(record.getMessage()) for record in caplog.records if record.name == ACCESS_LOGGER]
+
+    def test_request_is_logged_as_json(self, authenticated_client, caplog, monkeypatch):
+        '''Testing that a sampled request is logged as one JSON object with route, status, latency and DB stats'''
+
+        # Arrange
+        client, token, user = authenticated_client
+        monkeypatch.setattr(access_log, "ACCESS_LOG_SAMPLE_RATE", 1.0)
+        caplog.set_level(logging.INFO, logger=ACCESS_LOGGER)
+
+        # Act
+        response = client.get(client.app.url_path_for("v1-todos"), headers={"X-Request-ID": "req-123"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == "req-123"
+        entries = self._entries(caplog)
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry["request_id"] == "req-123"
+        assert entry["route"] == "v1-todos"
+        assert entry["path"] == "/api/v1/todos"
+        assert entry["status"] == 200
+        assert entry["queries"] >= 1
+        assert entry["latency_ms"] >= entry["db_ms"] >= 0
+        assert entry["sample_rate"] == 1.0
+
+    def test_unsampled_requests_are_not_logged(self, client: TestClient, caplog, monkeypatch):
+        '''Testing that requests outside the sample are skipped and still get a request id'''
+
+        # Arrange
+        monkeypatch.setattr(access_log, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+        caplog.set_level(logging.INFO, logger=ACCESS_LOGGER)
+
+        # Act
+        response = client.get("/health")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"]
+        assert self._entries(caplog) == []
+
+    def test_sample_rate_by_status_latency_and_route(self, monkeypatch):
+        '''Testing that 5xx and slow requests are always logged and routes can override the rate'''
+
+        # Arrange
+        monkeypatch.setattr(access_log, "ACCESS_LOG_SAMPLE_RATE", 0.01)
+        monkeypatch.setattr(access_log, "ACCESS_LOG_4XX_SAMPLE_RATE", 0.5)
+        monkeypatch.setattr(access_log, "ACCESS_LOG_SLOW_MS", 500)
+        monkeypatch.setattr(access_log, "ACCESS_LOG_ROUTE_SAMPLE_RATES", access_log._route_rates("v1-todo-store=0.2, v1-todos=0"))
+
+        # Assert
+        assert sample_rate("v1-todos", 503, 1) == 1.0
+        assert sample_rate("v1-todos", 200, 800) == 1.0
+        assert sample_rate("v1-todos", 404, 1) == 0.5
+        assert sample_rate("v1-todos", 200, 1) == 0.0
+        assert sample_rate("v1-todo-store", 200, 1) == 0.2
+        assert sample_rate(None, 200, 1) == 0.01
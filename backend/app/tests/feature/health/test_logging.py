@@ -0,0 +1,60 @@
+import logging
+import logging.handlers
+import queue
+import threading
+from fastapi.testclient import TestClient
+from app.utilis.logger import DroppingQueueHandler
+
+class Testlogging:
+    '''Tests for the queue-based, non-blocking logging pipeline'''
+
+    def _record(self, msg: str, *args) -> logging.LogRecord:
+        return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+    def test_full_queue_drops_and_counts(self):
+        '''Testing that a full queue drops records instead of blocking the caller'''
+
+        # Arrange
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+
+        # Act
+        for i in range(5):
+            handler.handle(self._record("line %s", i))
+
+        # Assert
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_records_are_formatted_on_the_writer_thread(self):
+        '''Testing that the message is formatted by the listener, not by the logging call'''
+
+        # Arrange
+        handler = DroppingQueueHandler(queue.Queue(maxsize=10))
+        written = []
+
+        class Capture(logging.Handler):
+            def emit(self, record):
+                written.append((self.format(record), threading.current_thread()))
+
+        listener = logging.handlers.QueueListener(handler.queue, Capture())
+
+        # Act
+        handler.handle(self._record("[RESPONSE] %s %s - Status: %s", "GET", "/todos", 200))
+        queued = handler.queue.queue[0]
+        listener.start()
+        listener.stop()
+
+        # Assert
+        assert queued.args == ("GET", "/todos", 200)
+        assert written[0][0] == "[RESPONSE] GET /todos - Status: 200"
+        assert written[0][1] is not threading.current_thread()
+
+    def test_logging_health_endpoint(self, client: TestClient):
+        '''Testing that the queue depth and dropped count are exposed for monitoring'''
+
+        # Act
+        response = client.get("/health/logging")
+
+        # Assert
+        assert response.status_code == 200
+        assert set(response.json()) == {"queued", "capacity", "dropped"}
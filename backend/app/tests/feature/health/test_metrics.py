@@ -0,0 +1,111 @@
+from fastapi.testclient import TestClient
+from app.database.query_stats import QueryStats
+import json
+import os
+from app.utilis import metrics as metrics_module
+from app.utilis.metrics import Metrics, render
+
+class Testmetrics:
+    '''Tests for the Prometheus /metrics endpoint and the cross-worker merge'''
+
+    def _stats(self, queries: int) -> QueryStats:
+        stats = QueryStats()
+        stats.queries = queries
+        stats.db_seconds = 0.01 * queries
+        return stats
+
+    def test_metrics_endpoint_counts_requests_by_route_name(self, authenticated_client):
+        '''Testing that requests are counted by route name and status, with their DB queries'''
+
+        # Arrange
+        client, token, user = authenticated_client
+        todos_url = client.app.url_path_for("v1-todos")
+
+        # Act
+        client.get(todos_url, headers={"Authorization": f"Bearer {token}"})
+        client.get(todos_url, headers={"Authorization": f"Bearer {token}"})
+        response = client.get("/metrics")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        lines = response.text.splitlines()
+        count = next(line for line in lines if line.startswith('http_requests_total{route="v1-todos",status="200"}'))
+        assert int(count.split()[-1]) >= 2
+        assert any(line.startswith('http_request_duration_seconds_bucket{le="+Inf",route="v1-todos",status="200"}') for line in lines)
+        assert any(line.startswith('http_request_db_queries_total{route="v1-todos"}') for line in lines)
+        assert any(line.startswith('db_pool_checked_out{pool="sync"}') for line in lines)
+        assert "http_requests_in_flight 1" in lines
+        assert "password_executor_pending 0" in lines
+
+    def test_histogram_buckets_are_cumulative(self):
+        '''Testing that latencies land in the right bucket and buckets add up'''
+
+        # Arrange
+        metrics = Metrics()
+
+        # Act
+        for seconds in (0.001, 0.02, 0.02, 30.0):
+            metrics.request_started()
+            metrics.request_finished("v1-todos", 200, seconds, self._stats(2))
+        lines = render(metrics.snapshot(), []).splitlines()
+
+        # Assert
+        labels = 'route="v1-todos",status="200"'
+        assert f'http_request_duration_seconds_bucket{{le="0.005",{labels}}} 1' in lines
+        assert f'http_request_duration_seconds_bucket{{le="0.025",{labels}}} 3' in lines
+        assert f'http_request_duration_seconds_bucket{{le="10.0",{labels}}} 3' in lines
+        assert f'http_request_duration_seconds_bucket{{le="+Inf",{labels}}} 4' in lines
+        assert f'http_request_duration_seconds_count{{{labels}}} 4' in lines
+        assert 'http_request_db_queries_total{route="v1-todos"} 8' in lines
+        assert "http_requests_in_flight 0" in lines
+
+    def test_workers_are_merged(self):
+        '''Testing that counters add up across workers and gauges of exited workers are dropped'''
+
+        # Arrange
+        own, other = Metrics(), Metrics()
+        for worker in (own, other):
+            worker.request_started()
+            worker.request_finished("v1-auth-login", 401, 0.1, self._stats(1))
+            worker.add_collector(lambda: {"password_executor_pending": [({}, 3)], "password_executor_rejected_total": [({}, 2)]})
+        exited = {**other.snapshot(), "pid": 2 ** 22 + 1, "written_at": 0}
+
+        # Act
+        lines = render(own.snapshot(), [exited]).splitlines()
+
+        # Assert
+        assert 'http_requests_total{route="v1-auth-login",status="401"} 2' in lines
+        assert "password_executor_pending 3" in lines
+        assert "password_executor_rejected_total 4" in lines
+
+    def test_snapshots_of_earlier_runs_are_removed(self, tmp_path, monkeypatch):
+        '''Testing that a worker deletes snapshots of other servers and reads only its own server's'''
+
+        # Arrange
+        monkeypatch.setattr(metrics_module, "METRICS_DIR", str(tmp_path))
+        other = Metrics()
+        other.request_started()
+        other.request_finished("v1-todos", 200, 0.1, self._stats(1))
+        (tmp_path / "worker-1.json").write_text(json.dumps({**other.snapshot(), "server": os.getppid() + 1}))
+        (tmp_path / "worker-2.json").write_text(json.dumps(other.snapshot()))
+
+        # Act
+        metrics_module._remove_other_servers()
+        snapshots = metrics_module._other_snapshots()
+
+        # Assert
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["worker-2.json"]
+        assert len(snapshots) == 1
+
+    def test_unmatched_routes_share_one_label(self, client: TestClient):
+        '''Testing that unknown paths do not create a label value per path'''
+
+        # Act
+        client.get("/no-such-path-1")
+        client.get("/no-such-path-2")
+        response = client.get("/metrics")
+
+        # Assert
+        assert 'route="unmatched",status="404"' in response.text
+        assert "no-such-path" not in response.text
@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.database import pool as pool_module
+from app.database.pool import TimedQueuePool, pool_options, pool_status
+from app.tests.conftest import TEST_DATABASE_URL
+
+class Testpool:
+    '''Tests for the configurable, instrumented connection pool'''
+
+    def test_pool_health_endpoint(self, client: TestClient):
+        '''Testing that the pool counters are exposed for monitoring'''
+
+        # Act
+        response = client.get("/health/pool")
+
+        # Assert
+        assert response.status_code == 200
+        stats = response.json()["sync"]
+        for key in ["size", "checked_in", "checked_out", "overflow", "checkouts", "timeouts", "wait_seconds_max"]:
+            assert key in stats
+
+    def test_pool_options_come_from_settings(self, monkeypatch):
+        '''Testing that the engine is built with the configured pool settings'''
+
+        # Arrange
+        monkeypatch.setattr(pool_module, "DB_POOL_SIZE", 3)
+        monkeypatch.setattr(pool_module, "DB_MAX_OVERFLOW", 1)
+        monkeypatch.setattr(pool_module, "DB_STATEMENT_TIMEOUT_MS", 1234)
+        monkeypatch.setattr(pool_module, "DB_QUERY_CACHE_SIZE", 2000)
+        monkeypatch.setattr(pool_module, "DB_PREPARE_THRESHOLD", 1)
+
+        # Act
+        options = pool_options("postgresql+psycopg2://user@localhost/db")
+        async_options = pool_options("postgresql+asyncpg://user@localhost/db", is_async=True)
+        prepared_options = pool_options("postgresql+psycopg://user@localhost/db")
+
+        # Assert
+        assert options["poolclass"] is TimedQueuePool
+        assert options["pool_size"] == 3
+        assert options["max_overflow"] == 1
+        assert options["connect_args"] == {"options": "-c statement_timeout=1234"}
+        assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "1234"}}
+        assert prepared_options["connect_args"] == {"options": "-c statement_timeout=1234", "prepare_threshold": 1}
+        assert options["query_cache_size"] == 2000
+
+    def test_statement_timeout_and_wait_stats(self, monkeypatch):
+        '''Testing statement_timeout on new connections and checkout timeouts being counted'''
+
+        # Arrange
+        monkeypatch.setattr(pool_module, "DB_POOL_SIZE", 1)
+        monkeypatch.setattr(pool_module, "DB_MAX_OVERFLOW", 0)
+        monkeypatch.setattr(pool_module, "DB_POOL_TIMEOUT", 0.1)
+        monkeypatch.setattr(pool_module, "DB_STATEMENT_TIMEOUT_MS", 1234)
+        engine = create_engine(TEST_DATABASE_URL, **pool_options(TEST_DATABASE_URL))
+
+        try:
+            # Act
+            with engine.connect() as connection:
+                timeout = connection.execute(text("SHOW statement_timeout")).scalar()
+                busy = pool_status(engine)
+                with pytest.raises(PoolTimeoutError):
+                    engine.connect()
+
+            # Assert
+            assert timeout == "1234ms"
+            assert busy["checked_out"] == 1
+            stats = pool_status(engine)
+            assert stats["checked_out"] == 0
+            assert stats["checkouts"] == 1
+            assert stats["timeouts"] == 1
+            assert stats["wait_seconds_max"] >= 0.1
+        finally:
+            engine.dispose()
@@ -0,0 +1,87 @@
+import json
+import logging
+from sqlalchemy import text
+from app.database import query_stats
+from app.database.query_stats import QueryStats, check_queries, redact
+from app.utilis import access_log
+from app.utilis.logger import ACCESS_LOGGER
+
+class Testquery_stats:
+    '''Tests for per-request SQL counting, query budget, N+1 and slow statement logging'''
+
+    def test_server_timing_header(self, authenticated_client):
+        '''Testing that responses report DB time and statement count in Server-Timing'''
+
+        # Arrange
+        client, token, user = authenticated_client
+
+        # Act
+        response = client.get(client.app.url_path_for("v1-todos"), headers={"Authorization": f"Bearer {token}"})
+
+        # Assert
+        assert response.status_code == 200
+        db_timing, total_timing = response.headers["Server-Timing"].split(", ")
+        assert db_timing.startswith("db;dur=")
+        assert 'queries"' in db_timing and 'desc="0 queries"' not in db_timing
+        assert total_timing.startswith("total;dur=")
+
+    def test_request_over_budget_is_flagged(self, authenticated_client, caplog, monkeypatch):
+        '''Testing that a request over the query budget is warned about and always access-logged'''
+
+        # Arrange
+        client, token, user = authenticated_client
+        monkeypatch.setattr(query_stats, "SQL_QUERY_BUDGET", 1)
+        monkeypatch.setattr(access_log, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+        caplog.set_level(logging.INFO)
+
+        # Act
+        client.get(client.app.url_path_for("v1-todos"), headers={"Authorization": f"Bearer {token}", "X-Request-ID": "req-budget"})
+
+        # Assert
+        warnings = [record.getMessage() for record in caplog.records if record.name == query_stats.__name__]
+        assert any("Query budget exceeded: v1-todos" in message and "req-budget" in message for message in warnings)
+        entries = [json.loads(record.getMessage()) for record in caplog.records if record.name == ACCESS_LOGGER]
+        assert entries[0]["query_warning"] is True
+        assert entries[0]["sample_rate"] == 1.0
+
+    def test_repeated_statement_is_flagged(self, caplog, monkeypatch):
+        '''Testing that one statement run many times in a request is reported as a likely N+1'''
+
+        # Arrange
+        monkeypatch.setattr(query_stats, "SQL_QUERY_BUDGET", 0)
+        monkeypatch.setattr(query_stats, "SQL_REPEATED_QUERY_THRESHOLD", 3)
+        caplog.set_level(logging.WARNING, logger=query_stats.__name__)
+        stats = QueryStats()
+        stats.statements = {"SELECT todos.id FROM todos WHERE todos.id = %(id_1)s": 3, "SELECT 1": 1}
+
+        # Act
+        flagged = check_queries(stats, "v1-todos", "req-1")
+
+        # Assert
+        assert flagged
+        assert "ran 3 times" in caplog.records[0].getMessage()
+        assert not check_queries(QueryStats(), "v1-todos", "req-2")
+
+    def test_slow_statement_is_logged_with_redacted_parameters(self, db_session, caplog, monkeypatch):
+        '''Testing that slow statements are logged without their parameter values'''
+
+        # Arrange
+        monkeypatch.setattr(query_stats, "SQL_SLOW_QUERY_MS", 0.000001)
+        caplog.set_level(logging.WARNING, logger=query_stats.__name__)
+
+        # Act
+        db_session.execute(text("SELECT :email AS email, :age AS age"), {"email": "secret@example.com", "age": 42})
+
+        # Assert
+        messages = [record.getMessage() for record in caplog.records if "Slow statement" in record.getMessage()]
+        assert messages
+        assert "secret@example.com" not in messages[-1]
+        assert "'email': 'str'" in messages[-1]
+
+    def test_redact(self):
+        '''Testing that parameters keep their shape but lose their values'''
+
+        # Assert
+        assert redact({"title": "x", "priority": 1}) == {"title": "str", "priority": "int"}
+        assert redact(("x", None)) == ["str", "NoneType"]
+        assert redact([{"title": "a"}, {"title": "b"}]) == {"rows": 2, "first": {"title": "str"}}
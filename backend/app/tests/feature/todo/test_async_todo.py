@@ -0,0 +1,167 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.database.base import async_database_url, get_async_db
+from app.handlers.validation import register_exception_handlers
+from app.routers import web_async
+from app.utilis import auth_cache
+
+class Testasync_todo:
+    '''Tests for the async routers (DATABASE_ASYNC=true)'''
+
+    @pytest.fixture
+    def async_client(self, db_session: Session):
+        '''client for an app serving the async router, each test in a rolled back asyncpg transaction'''
+        async_app = FastAPI()
+        register_exception_handlers(async_app)
+        async_app.include_router(web_async.router, prefix="/api/v1")
+
+        # connections are bound to the event loop of the TestClient portal
+        engine = create_async_engine(async_database_url, poolclass=NullPool)
+
+        async def begin():
+            connection = await engine.connect()
+            transaction = await connection.begin()
+            session = AsyncSession(bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+            return connection, transaction, session
+
+        async def end(connection, transaction, session):
+            await session.close()
+            await transaction.rollback()
+            await connection.close()
+            await engine.dispose()
+
+        with TestClient(async_app) as test_client:
+            connection, transaction, session = test_client.portal.call(begin)
+
+            async def override_get_async_db():
+                yield session
+
+            async_app.dependency_overrides[get_async_db] = override_get_async_db
+            try:
+                yield test_client
+            finally:
+                test_client.portal.call(end, connection, transaction, session)
+
+        auth_cache.clear()
+
+    def _register(self, client: TestClient, fake_user_data: dict) -> TestClient:
+        response = client.post(client.app.url_path_for("v1-auth-register"), json=fake_user_data)
+        assert response.status_code == 200
+        client.headers.update({"Authorization": f"Bearer {response.json()['access_token']}"})
+        return client
+
+    def test_register_and_get_me(self, async_client: TestClient, fake_user_data: dict):
+        '''Testing that a user registered through the async stack is authenticated by it'''
+
+        # Arrange
+        client = self._register(async_client, fake_user_data)
+
+        # Act
+        response = client.get(client.app.url_path_for("v1-auth-me"))
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["email"] == fake_user_data["email"]
+
+    def test_todo_crud(self, async_client: TestClient, fake_user_data: dict):
+        '''Testing store, index, order update, completed update and destroy on the async stack'''
+
+        # Arrange
+        client = self._register(async_client, fake_user_data)
+        storeUrl = client.app.url_path_for("v1-todo-store")
+        ids = []
+        for title in ["first", "second", "third"]:
+            response = client.post(storeUrl, json={"title": title, "description": "desc", "priority": "low"})
+            assert response.status_code == 200
+            ids.append(response.json()["todo"]["id"])
+
+        # duplicated title
+        response = client.post(storeUrl, json={"title": "first", "description": "desc", "priority": "low"})
+        assert response.status_code == 409
+
+        # Act - move the last todo to the top
+        response = client.put(client.app.url_path_for("v1-todo-order-update", id=ids[2]), json={"order": 1})
+        assert response.status_code == 200
+
+        response = client.put(client.app.url_path_for("v1-todo-completed-update", id=ids[0]), json={"is_completed": True})
+        assert response.status_code == 200
+        assert response.json()["todo"]["is_completed"] is True
+
+        response = client.delete(client.app.url_path_for("v1-todo-destroy", id=ids[1]))
+        assert response.status_code == 200
+
+        # Assert
+        response = client.get(client.app.url_path_for("v1-todos"))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert [item["id"] for item in data["items"]] == [ids[2], ids[0]]
+        assert [item["order"] for item in data["items"]] == [1, 2]
+
+    def test_cursor_pages(self, async_client: TestClient, fake_user_data: dict):
+        '''Testing that keyset pages on the async stack are numbered from the cursor'''
+
+        # Arrange
+        client = self._register(async_client, fake_user_data)
+        client.post(client.app.url_path_for("v1-todo-bulk-store"), json={"todos": [{"title": f"todo {i}"} for i in range(5)]})
+        todosUrl = client.app.url_path_for("v1-todos")
+        cursor = client.get(todosUrl, params={"page_size": 2}).json()["next_cursor"]
+
+        # Act
+        items = []
+        while cursor:
+            data = client.get(todosUrl, params={"page_size": 2, "cursor": cursor}).json()
+            items += data["items"]
+            cursor = data["next_cursor"]
+
+        # Assert
+        assert [(item["title"], item["order"]) for item in items] == [("todo 2", 3), ("todo 3", 4), ("todo 4", 5)]
+
+    def test_bulk_store(self, async_client: TestClient, fake_user_data: dict):
+        '''Testing bulk create on the async stack'''
+
+        # Arrange
+        client = self._register(async_client, fake_user_data)
+        items = [{"title": "first", "due_date": None}, {"title": "second", "priority": "high"}, {"title": "first"}]
+
+        # Act
+        response = client.post(client.app.url_path_for("v1-todo-bulk-store"), json={"todos": items})
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 2
+        assert [result["status"] for result in data["results"]] == [200, 200, 409]
+        assert [result["todo"]["order"] for result in data["results"][:2]] == [1, 2]
+
+    def test_bulk_update(self, async_client: TestClient, fake_user_data: dict):
+        '''Testing bulk complete and delete on the async stack'''
+
+        # Arrange
+        client = self._register(async_client, fake_user_data)
+        response = client.post(client.app.url_path_for("v1-todo-bulk-store"), json={"todos": [{"title": "first"}, {"title": "second"}]})
+        ids = [result["todo"]["id"] for result in response.json()["results"]]
+        bulkUrl = client.app.url_path_for("v1-todo-bulk-update")
+
+        # Act
+        completed = client.post(bulkUrl, json={"operation": "complete", "ids": ids[:1]})
+        deleted = client.post(bulkUrl, json={"operation": "delete", "filter": {"completed": True}})
+
+        # Assert
+        assert completed.json()["affected"] == 1
+        assert deleted.json()["affected"] == 1
+        items = client.get(client.app.url_path_for("v1-todos")).json()["items"]
+        assert [(item["id"], item["order"]) for item in items] == [(ids[1], 1)]
+
+    def test_requires_authentication(self, async_client: TestClient):
+        '''Testing that the async routes reject an unknown token'''
+
+        # Act
+        response = async_client.get(async_client.app.url_path_for("v1-todos"), headers={"Authorization": "Bearer invalid"})
+
+        # Assert
+        assert response.status_code == 401
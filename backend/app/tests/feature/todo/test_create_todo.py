@@ -1,6 +1,10 @@
+import uuid
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.models.todo import Todo
 from datetime import datetime, timedelta, timezone
 
 
@@ -75,4 +79,95 @@ class Testcreate_todo:
             headers={"Authorization": f"Bearer {token}"}
         )       
         assert todoResponse.status_code == 422
-        assert 'Due date must be in the future' in todoResponse.json()['detail'][0]['msg']
\ No newline at end of file
+        assert 'Due date must be in the future' in todoResponse.json()['detail'][0]['msg']
+
+    def test_create_todo_after_keys_past_32_bits(self, authenticated_client, db_session):
+        '''test appends keep working once a user's sort keys have grown past the int32 range'''
+
+        client, token, user = authenticated_client
+        db_session.add(Todo(id=uuid.uuid4(), user_id=user.id, title="far down", sort_key=2 ** 40))
+        db_session.flush()
+
+        response = client.post(client.app.url_path_for("v1-todo-store"), json={"title": "appended", "priority": "low"})
+        assert response.status_code == 200
+        assert response.json()["todo"]["order"] == 2
+
+        response = client.post(client.app.url_path_for("v1-todo-bulk-store"), json={"todos": [{"title": "bulk appended"}]})
+        assert response.json()["results"][0]["todo"]["order"] == 3
+
+    def test_create_todo_is_one_statement(self, authenticated_client, db_session, fake_todo_data: dict, captured_statements):
+        '''test create todo issues a single INSERT and returns the appended position'''
+
+        client, token, user = authenticated_client
+        todoUrl = client.app.url_path_for("v1-todo-store")
+        firstResponse = client.post(todoUrl, json={**fake_todo_data, "title": "todo first"})
+        assert firstResponse.json()["todo"]["order"] == 1
+
+        with captured_statements() as statements:
+            todoResponse = client.post(todoUrl, json={**fake_todo_data, "title": "todo second"})
+
+        assert todoResponse.status_code == 200
+        assert todoResponse.json()["todo"]["order"] == 2
+        assert todoResponse.json()["todo"]["is_completed"] is False
+        todo_statements = [s for s in statements if "todos" in s]
+        assert len(todo_statements) == 1 and todo_statements[0].lstrip().startswith("INSERT INTO todos")
+
+    def test_title_is_unique_per_user_in_database(self, test_user, db_session):
+        '''test the database rejects a second todo with the same title for a user'''
+
+        row = {"user_id": test_user.id, "title": "todo twice", "sort_key": 1024}
+        db_session.execute(insert(Todo).values(id=uuid.uuid4(), **row))
+
+        savepoint = db_session.begin_nested()
+        with pytest.raises(IntegrityError):
+            db_session.execute(insert(Todo).values(id=uuid.uuid4(), **row))
+        savepoint.rollback()
+
+
+    def test_bulk_create_todos(self, authenticated_client, db_session, fake_todo_data: dict, captured_statements):
+        '''test bulk create inserts the batch in one statement and reports each item'''
+
+        client, token, user = authenticated_client
+        storeResponse = client.post(client.app.url_path_for("v1-todo-store"), json={**fake_todo_data, "title": "todo taken"})
+        assert storeResponse.status_code == 200
+
+        items = [{"title": title, "priority": "high"} for title in ["todo a", "todo taken", "todo b", "todo a", "todo c"]]
+        with captured_statements() as statements:
+            response = client.post(client.app.url_path_for("v1-todo-bulk-store"), json={"todos": items})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 3
+        assert [result["status"] for result in data["results"]] == [200, 409, 200, 409, 200]
+        assert [result["index"] for result in data["results"]] == [0, 1, 2, 3, 4]
+        created = [result["todo"] for result in data["results"] if result["status"] == 200]
+        assert [(todo["title"], todo["order"], todo["priority"]) for todo in created] == [
+            ("todo a", 2, "high"), ("todo b", 3, "high"), ("todo c", 4, "high"),
+        ]
+        assert data["results"][1]["detail"] == "Title already exists"
+
+        todo_statements = [s for s in statements if "todos" in s]
+        assert len(todo_statements) == 1 and todo_statements[0].lstrip().startswith("INSERT INTO todos")
+
+        listResponse = client.get(client.app.url_path_for("v1-todos"))
+        assert [(item["title"], item["order"]) for item in listResponse.json()["items"]] == [
+            ("todo taken", 1), ("todo a", 2), ("todo b", 3), ("todo c", 4),
+        ]
+
+    def test_bulk_create_rejects_invalid_batch(self, authenticated_client):
+        '''test bulk create validates every item and the batch size'''
+
+        client, token, user = authenticated_client
+        bulkUrl = client.app.url_path_for("v1-todo-bulk-store")
+
+        response = client.post(bulkUrl, json={"todos": [{"title": "todo ok"}, {"title": "no"}]})
+        assert response.status_code == 422
+
+        response = client.post(bulkUrl, json={"todos": []})
+        assert response.status_code == 422
+
+        response = client.post(bulkUrl, json={"todos": [{"title": f"todo {i}"} for i in range(501)]})
+        assert response.status_code == 422
+
+        listResponse = client.get(client.app.url_path_for("v1-todos"))
+        assert listResponse.json()["items"] == []
@@ -1,6 +1,11 @@
 from pprint import pprint
 import pytest
 from fastapi.testclient import TestClient
+import uuid
+from app.utilis.paginator import encode_cursor
+from pydantic import ValidationError
+from app.controllers.todo_controller import TodoController
+from app.requests.todo.todo_index_request import TodoIndexRequest
 
 class Testtodo:
     '''Tests for todo'''
@@ -270,4 +275,164 @@ class Testtodo:
         r_search = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"search": "medium 1"})
         assert r_search.status_code == 200
         items_search = r_search.json()["items"]
-        assert any(it["title"] == "todo medium 1" for it in items_search)
\ No newline at end of file
+        assert any(it["title"] == "todo medium 1" for it in items_search)
+    def test_todo_index_pagination(self, authenticated_client):
+        '''test index returns only the requested page with the full total'''
+
+        client, token, user = authenticated_client
+
+        todo_url = client.app.url_path_for("v1-todo-store")
+        for i in range(5):
+            resp = client.post(todo_url, json={"title": f"page todo {i}", "priority": "low"}, headers={"Authorization": f"Bearer {token}"})
+            assert resp.status_code == 200
+
+        todos_url = client.app.url_path_for("v1-todos")
+
+        r_page2 = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"page": 2, "page_size": 2})
+        assert r_page2.status_code == 200
+        data = r_page2.json()
+        assert data["page"] == 2
+        assert data["page_size"] == 2
+        assert data["total"] == 5
+        assert [it["title"] for it in data["items"]] == ["page todo 2", "page todo 3"]
+
+        r_last = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"page": 3, "page_size": 2})
+        assert r_last.status_code == 200
+        assert r_last.json()["total"] == 5
+        assert [it["title"] for it in r_last.json()["items"]] == ["page todo 4"]
+
+        r_past = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"page": 4, "page_size": 2})
+        assert r_past.status_code == 200
+        assert r_past.json()["total"] == 5
+        assert r_past.json()["items"] == []
+
+    def test_todo_index_cursor_pagination(self, authenticated_client):
+        '''test index walks the whole list with next_cursor in keyset mode'''
+
+        client, token, user = authenticated_client
+
+        todo_url = client.app.url_path_for("v1-todo-store")
+        for i in range(5):
+            resp = client.post(todo_url, json={"title": f"cursor todo {i}", "priority": "low"}, headers={"Authorization": f"Bearer {token}"})
+            assert resp.status_code == 200
+
+        todos_url = client.app.url_path_for("v1-todos")
+
+        # first page in offset mode hands out the cursor for the next one
+        r_first = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"page_size": 2})
+        assert r_first.status_code == 200
+        titles = [it["title"] for it in r_first.json()["items"]]
+        cursor = r_first.json()["next_cursor"]
+        assert cursor is not None
+
+        while cursor:
+            r_next = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"page_size": 2, "cursor": cursor})
+            assert r_next.status_code == 200
+            titles += [it["title"] for it in r_next.json()["items"]]
+            cursor = r_next.json()["next_cursor"]
+
+        assert titles == [f"cursor todo {i}" for i in range(5)]
+
+    def test_todo_index_cursor_carries_position(self, authenticated_client, captured_statements):
+        '''test unfiltered cursor pages are numbered from the cursor, without row_number() over the list'''
+
+        client, token, user = authenticated_client
+
+        todo_url = client.app.url_path_for("v1-todo-store")
+        for i in range(5):
+            resp = client.post(todo_url, json={"title": f"cursor todo {i}", "priority": "high" if i % 2 else "low"})
+            assert resp.status_code == 200
+
+        todos_url = client.app.url_path_for("v1-todos")
+        cursor = client.get(todos_url, params={"page_size": 2}).json()["next_cursor"]
+        orders = []
+        with captured_statements() as statements:
+            while cursor:
+                data = client.get(todos_url, params={"page_size": 2, "cursor": cursor}).json()
+                orders += [it["order"] for it in data["items"]]
+                cursor = data["next_cursor"]
+
+        assert orders == [3, 4, 5]
+        assert not any("row_number" in statement for statement in statements)
+
+        # filtered pages are not a contiguous slice: numbered within the whole list
+        first = client.get(todos_url, params={"page_size": 1, "priority": "high"}).json()
+        assert [it["order"] for it in first["items"]] == [2]
+        data = client.get(todos_url, params={"page_size": 1, "priority": "high", "cursor": first["next_cursor"]}).json()
+        assert [it["order"] for it in data["items"]] == [4]
+
+    def test_todo_index_invalid_cursor(self, authenticated_client):
+        '''test index rejects a cursor that was not issued by the api'''
+
+        client, token, user = authenticated_client
+
+        todos_url = client.app.url_path_for("v1-todos")
+        response = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"cursor": "not-a-cursor"})
+        assert response.status_code == 422
+
+        # a sort_key outside BIGINT is rejected before it reaches the database
+        forged = encode_cursor([2 ** 70, str(uuid.uuid4())])
+        response = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"cursor": forged})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["query", "cursor"]
+
+    def test_todo_index_server_side_validation_error_is_not_a_client_error(self, authenticated_client, monkeypatch):
+        '''test a pydantic error raised past the query model is a server error, not a 422'''
+
+        client, token, user = authenticated_client
+
+        def broken_index(*args, **kwargs):
+            # e.g. a response model built from bad data
+            return TodoIndexRequest(page=0)
+
+        monkeypatch.setattr(TodoController, "index", staticmethod(broken_index))
+        with pytest.raises(ValidationError):
+            client.get(client.app.url_path_for("v1-todos"), headers={"Authorization": f"Bearer {token}"})
+
+    def test_todo_search_matches_description_and_prefix(self, authenticated_client):
+        '''test search matches words of the description and word prefixes'''
+
+        client, token, user = authenticated_client
+
+        todo_url = client.app.url_path_for("v1-todo-store")
+        client.post(todo_url, json={"title": "groceries", "description": "buy milk and bread", "priority": "low"}, headers={"Authorization": f"Bearer {token}"})
+        client.post(todo_url, json={"title": "gym", "description": "leg day", "priority": "low"}, headers={"Authorization": f"Bearer {token}"})
+
+        todos_url = client.app.url_path_for("v1-todos")
+        response = client.get(todos_url, headers={"Authorization": f"Bearer {token}"}, params={"search": "mil bre"})
+        assert response.status_code == 200
+        assert [it["title"] for it in response.json()["items"]] == ["groceries"]
+
+    def test_filtered_todos_report_their_list_position(self, authenticated_client):
+        '''test that the order of filtered todos is their position in the full list'''
+
+        client, token, user = authenticated_client
+        todo_url = client.app.url_path_for("v1-todo-store")
+        for i, priority in enumerate(["low", "high", "low", "high"]):
+            response = client.post(todo_url, json={"title": f"position todo {i}", "description": "desc", "priority": priority})
+            assert response.status_code == 200
+
+        response = client.get(client.app.url_path_for("v1-todos"), params={"priority": "high"})
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [item["title"] for item in items] == ["position todo 1", "position todo 3"]
+        assert [item["order"] for item in items] == [2, 4]
+
+    def test_todo_list_items_match_store_response(self, authenticated_client, fake_todo_data: dict):
+        '''test list items carry the same fields as the stored todo and nothing internal'''
+
+        client, token, user = authenticated_client
+        storeResponse = client.post(client.app.url_path_for("v1-todo-store"), json=fake_todo_data)
+        stored = storeResponse.json()["todo"]
+
+        data = client.get(client.app.url_path_for("v1-todos")).json()
+        assert set(data) == {"items", "page", "page_size", "total", "next_cursor"}
+        assert data["items"] == [stored]
+
+        for title in ["todo two", "todo three"]:
+            client.post(client.app.url_path_for("v1-todo-store"), json={**fake_todo_data, "title": title})
+        firstPage = client.get(client.app.url_path_for("v1-todos"), params={"page_size": 1}).json()
+        cursorPage = client.get(client.app.url_path_for("v1-todos"), params={"page_size": 1, "cursor": firstPage["next_cursor"]}).json()
+        assert set(cursorPage) == {"items", "page_size", "next_cursor"}
+        assert cursorPage["items"][0]["order"] == 2
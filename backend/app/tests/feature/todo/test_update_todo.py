@@ -1,5 +1,9 @@
 import pprint
 import pytest
+from sqlalchemy import update
+from app.models.todo import Todo
+from app.database.faker.user_faker import make_user
+from app.database.faker.todo_faker import make_todo
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
@@ -249,4 +253,172 @@ class Testupdate_todo:
         }, headers={"Authorization": f"Bearer {token}"})
         assert todoUpdateResponse.status_code == 200
         assert "Todo completed updated successfully" in todoUpdateResponse.json()["message"]
-        assert todoUpdateResponse.json()["todo"]["is_completed"] == False
\ No newline at end of file
+        assert todoUpdateResponse.json()["todo"]["is_completed"] == False
+
+    def _store_todos(self, client, titles: list) -> list:
+        storeUrl = client.app.url_path_for("v1-todo-store")
+        ids = []
+        for title in titles:
+            response = client.post(storeUrl, json={"title": f"todo {title}", "description": "desc", "priority": "low"})
+            assert response.status_code == 200
+            ids.append(response.json()["todo"]["id"])
+        return ids
+
+    def _list_titles(self, client) -> list:
+        response = client.get(client.app.url_path_for("v1-todos"))
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [item["order"] for item in items] == list(range(1, len(items) + 1))
+        return [item["title"].removeprefix("todo ") for item in items]
+
+    def test_update_todo_order_keeps_visual_order(self, authenticated_client):
+        '''test moving todos to the top, middle and end keeps the list in the requested order'''
+
+        client, token, user = authenticated_client
+        ids = self._store_todos(client, ["a", "b", "c", "d", "e"])
+        orderUrl = lambda id: client.app.url_path_for("v1-todo-order-update", id=id)
+
+        assert client.put(orderUrl(ids[4]), json={"order": 1}).json()["todo"]["order"] == 1
+        assert self._list_titles(client) == ["e", "a", "b", "c", "d"]
+
+        assert client.put(orderUrl(ids[0]), json={"order": 4}).json()["todo"]["order"] == 4
+        assert self._list_titles(client) == ["e", "b", "c", "a", "d"]
+
+        assert client.put(orderUrl(ids[1]), json={"order": 99}).json()["todo"]["order"] == 5
+        assert self._list_titles(client) == ["e", "c", "a", "d", "b"]
+
+        # moving a todo to its current position changes nothing
+        assert client.put(orderUrl(ids[2]), json={"order": 2}).json()["todo"]["order"] == 2
+        assert self._list_titles(client) == ["e", "c", "a", "d", "b"]
+
+    def test_update_todo_order_updates_one_row(self, authenticated_client, db_session, captured_statements):
+        '''test moving a todo writes only the moved row'''
+
+        client, token, user = authenticated_client
+        ids = self._store_todos(client, [str(i) for i in range(10)])
+
+        with captured_statements() as statements:
+            response = client.put(client.app.url_path_for("v1-todo-order-update", id=ids[8]), json={"order": 2})
+
+        assert response.status_code == 200
+        updates = [statement for statement in statements if statement.lstrip().upper().startswith("UPDATE TODOS")]
+        assert len(updates) == 1
+        assert self._list_titles(client)[:3] == ["0", "8", "1"]
+
+    def test_update_todo_order_rebalances_when_keys_run_out(self, authenticated_client, db_session):
+        '''test adjacent keys are respaced before inserting between them'''
+
+        client, token, user = authenticated_client
+        ids = self._store_todos(client, ["a", "b", "c"])
+        for sort_key, id in enumerate(ids, start=1):
+            db_session.execute(update(Todo).where(Todo.id == id).values(sort_key=sort_key))
+        db_session.expire_all()
+
+        response = client.put(client.app.url_path_for("v1-todo-order-update", id=ids[2]), json={"order": 2})
+
+        assert response.status_code == 200
+        assert response.json()["todo"]["order"] == 2
+        assert self._list_titles(client) == ["a", "c", "b"]
+
+    def test_destroy_todo_touches_only_deleted_row(self, authenticated_client, db_session, captured_statements):
+        '''test deleting a todo writes no other row and positions stay contiguous'''
+
+        client, token, user = authenticated_client
+        ids = self._store_todos(client, ["a", "b", "c", "d"])
+
+        with captured_statements() as statements:
+            response = client.delete(client.app.url_path_for("v1-todo-destroy", id=ids[1]))
+
+        assert response.status_code == 200
+        assert response.json()["todo"]["order"] == 2
+        writes = [s for s in statements if s.lstrip().upper().startswith(("UPDATE", "DELETE", "INSERT"))]
+        assert len(writes) == 1 and writes[0].lstrip().upper().startswith("DELETE FROM TODOS")
+        assert self._list_titles(client) == ["a", "c", "d"]
+
+    def test_bulk_update_by_ids_is_one_statement(self, authenticated_client, db_session, captured_statements):
+        '''test bulk complete runs one UPDATE over the given ids and counts changed rows'''
+
+        client, token, user = authenticated_client
+        ids = self._store_todos(client, ["a", "b", "c", "d"])
+        bulkUrl = client.app.url_path_for("v1-todo-bulk-update")
+        client.put(client.app.url_path_for("v1-todo-completed-update", id=ids[0]), json={"is_completed": True})
+
+        with captured_statements() as statements:
+            response = client.post(bulkUrl, json={"operation": "complete", "ids": ids[:3]})
+
+        assert response.status_code == 200
+        assert response.json()["affected"] == 2
+        todo_statements = [s for s in statements if "todos" in s]
+        assert len(todo_statements) == 1 and todo_statements[0].lstrip().startswith("UPDATE todos")
+
+        items = client.get(client.app.url_path_for("v1-todos")).json()["items"]
+        assert [item["is_completed"] for item in items] == [True, True, True, False]
+
+        response = client.post(bulkUrl, json={"operation": "priority", "priority": "high", "ids": ids[2:]})
+        assert response.json()["affected"] == 2
+        items = client.get(client.app.url_path_for("v1-todos")).json()["items"]
+        assert [item["priority"] for item in items] == ["low", "low", "high", "high"]
+
+    def test_bulk_update_by_filter(self, authenticated_client):
+        '''test bulk delete by filter removes only the user's matching todos'''
+
+        client, token, user = authenticated_client
+        ids = self._store_todos(client, ["a", "b", "c"])
+        bulkUrl = client.app.url_path_for("v1-todo-bulk-update")
+        client.put(client.app.url_path_for("v1-todo-completed-update", id=ids[1]), json={"is_completed": True})
+
+        response = client.post(bulkUrl, json={"operation": "delete", "filter": {"completed": True}})
+        assert response.status_code == 200
+        assert response.json()["affected"] == 1
+        assert self._list_titles(client) == ["a", "c"]
+
+        response = client.post(bulkUrl, json={"operation": "uncomplete", "filter": {}})
+        assert response.json()["affected"] == 0
+
+    def test_bulk_update_ignores_other_users_todos(self, authenticated_client, db_session):
+        '''test bulk update by ids never touches todos of another user'''
+
+        client, token, user = authenticated_client
+        ids = self._store_todos(client, ["a"])
+        other = make_user()
+        db_session.add(other)
+        db_session.flush()
+        othersTodo = make_todo(user_id=other.id)
+        db_session.add(othersTodo)
+        db_session.flush()
+
+        response = client.post(
+            client.app.url_path_for("v1-todo-bulk-update"),
+            json={"operation": "delete", "ids": [str(othersTodo.id), ids[0]]},
+        )
+        assert response.status_code == 200
+        assert response.json()["affected"] == 1
+        assert db_session.get(Todo, othersTodo.id) is not None
+
+    def test_bulk_update_validation(self, authenticated_client):
+        '''test bulk update requires exactly one selection and a priority for the priority operation'''
+
+        client, token, user = authenticated_client
+        bulkUrl = client.app.url_path_for("v1-todo-bulk-update")
+
+        assert client.post(bulkUrl, json={"operation": "complete"}).status_code == 422
+        assert client.post(bulkUrl, json={"operation": "complete", "ids": [], "filter": {}}).status_code == 422
+        assert client.post(bulkUrl, json={"operation": "priority", "filter": {}}).status_code == 422
+        assert client.post(bulkUrl, json={"operation": "archive", "filter": {}}).status_code == 422
+
+    def test_bulk_delete_by_empty_filter_requires_select_all(self, authenticated_client, db_session):
+        '''test an empty filter cannot delete the whole list unless select_all is set'''
+
+        client, token, user = authenticated_client
+        for i in range(2):
+            db_session.add(make_todo(user_id=user.id, title=f"todo {i}", sort_key=i + 1))
+        db_session.flush()
+        bulkUrl = client.app.url_path_for("v1-todo-bulk-update")
+
+        assert client.post(bulkUrl, json={"operation": "delete", "filter": {}}).status_code == 422
+        assert client.post(bulkUrl, json={"operation": "delete", "filter": {"priority": None}}).status_code == 422
+        assert len(self._list_titles(client)) == 2
+
+        response = client.post(bulkUrl, json={"operation": "delete", "filter": {}, "select_all": True})
+        assert response.status_code == 200
+        assert response.json()["affected"] == 2
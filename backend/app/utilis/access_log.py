@@ -0,0 +1,82 @@
+"""Structured access log: one JSON object per sampled request.
+
+Entries go to the `app.access` logger, which `setup_logging` writes to
+`logs/access.log` (message only, one JSON object per line). Which requests are
+logged:
+- 5xx responses, requests slower than `ACCESS_LOG_SLOW_MS` and requests
+  flagged by the query checks (`query_warning`, see app/database/query_stats.py): always
+- 4xx responses: `ACCESS_LOG_4XX_SAMPLE_RATE`
+- everything else: the route's rate from `ACCESS_LOG_ROUTE_SAMPLE_RATES`
+  (e.g. "v1-todos=0.001,v1-todo-store=0.1"), else `ACCESS_LOG_SAMPLE_RATE`
+Each entry records the rate it was sampled at, so counts can be scaled back up.
+"""
+import json
+import os
+import random
+from datetime import datetime, timezone
+from typing import Optional
+from app.database.query_stats import QueryStats
+
+# Share of 2xx/3xx requests logged (0-1)
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "0.01"))
+# Share of 4xx requests logged (0-1)
+ACCESS_LOG_4XX_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_4XX_SAMPLE_RATE", "0.1"))
+# Requests slower than this (ms) are always logged
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "1000"))
+
+
+def _route_rates(value: str) -> dict:
+    rates = {}
+    for item in value.split(","):
+        if "=" in item:
+            route, rate = item.split("=", 1)
+            rates[route.strip()] = float(rate)
+    return rates
+
+
+# Per-route rates for 2xx/3xx requests, by route name: "v1-todos=0.001,v1-todo-store=0.1"
+ACCESS_LOG_ROUTE_SAMPLE_RATES = _route_rates(os.getenv("ACCESS_LOG_ROUTE_SAMPLE_RATES", ""))
+
+
+def sample_rate(route: Optional[str], status: int, latency_ms: float, query_warning: bool = False) -> float:
+    """Probability of logging a request with this outcome."""
+    if status >= 500 or latency_ms >= ACCESS_LOG_SLOW_MS or query_warning:
+        return 1.0
+    if status >= 400:
+        return ACCESS_LOG_4XX_SAMPLE_RATE
+    return ACCESS_LOG_ROUTE_SAMPLE_RATES.get(route, ACCESS_LOG_SAMPLE_RATE)
+
+
+class AccessEntry(dict):
+    """Access log fields, rendered as JSON only when the log writer formats it."""
+
+    def __str__(self) -> str:
+        return json.dumps(self, separators=(",", ":"), default=str)
+
+
+def access_entry(
+        request_id: str,
+        method: str,
+        route: Optional[str],
+        path: str,
+        status: int,
+        latency_ms: float,
+        stats: QueryStats,
+        rate: float,
+        query_warning: bool = False) -> Optional[AccessEntry]:
+    """The entry to log for a request, or None when sampling skips it."""
+    if rate < 1.0 and random.random() >= rate:
+        return None
+    return AccessEntry(
+        ts=datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        request_id=request_id,
+        method=method,
+        route=route,
+        path=path,
+        status=status,
+        latency_ms=round(latency_ms, 2),
+        db_ms=round(stats.db_seconds * 1000, 2),
+        queries=stats.queries,
+        query_warning=query_warning,
+        sample_rate=rate,
+    )
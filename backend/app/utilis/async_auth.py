@@ -0,0 +1,98 @@
+"""Async counterparts of the auth dependencies in `app.utilis.auth`.
+
+Used by the async routers (`DATABASE_ASYNC=true`); same rules, same errors,
+but the session lookup and writes go through an `AsyncSession`.
+"""
+from datetime import datetime, timedelta
+from typing import Tuple
+from fastapi import HTTPException, status, Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.base import get_async_db
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.utilis import auth_cache
+from app.utilis.auth import (
+    security,
+    hash_token,
+    user_id_from_token,
+    session_with_user_statement,
+    session_idle_time,
+    touch_session_statement,
+    SESSION_EXPIRE_DAYS,
+    SESSION_TOUCH_INTERVAL_MINUTES,
+)
+
+
+async def get_current_auth_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> Tuple[SessionModel, User]:
+    """Async version of `get_current_auth`: resolves the (session, user) pair from the token."""
+    token = credentials.credentials
+    user_id = user_id_from_token(token)
+
+    token_hash = hash_token(token)
+    cached = await auth_cache.get_async(db, token_hash)
+    if cached is not None:
+        db_session, user = cached
+    else:
+        row = (await db.execute(session_with_user_statement(token_hash))).first()
+        db_session, user = row if row is not None else (None, None)
+        if db_session is not None and user is not None:
+            auth_cache.store(token_hash, db_session, user)
+
+    # The token must belong to the user the session was issued for
+    if db_session is not None and db_session.user_id != user_id:
+        db_session = None
+
+    if not db_session or db_session in db.deleted:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session not found"
+        )
+
+    now = datetime.utcnow()
+    time_diff = session_idle_time(db_session, now)
+
+    if time_diff.days >= SESSION_EXPIRE_DAYS:
+        # Session expired - delete it
+        auth_cache.invalidate_token(token_hash)
+        await db.delete(db_session)
+        await db.flush()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has expired"
+        )
+
+    if time_diff >= timedelta(minutes=SESSION_TOUCH_INTERVAL_MINUTES):
+        if (await db.execute(touch_session_statement(db_session.id, now))).rowcount == 0:
+            # a cached session deleted meanwhile (logout or expiry on another worker)
+            auth_cache.invalidate_token(token_hash)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session not found"
+            )
+        auth_cache.touch_session(token_hash, now)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    return db_session, user
+
+
+async def get_current_session_async(
+    current_auth: Tuple[SessionModel, User] = Depends(get_current_auth_async),
+) -> SessionModel:
+    """Async dependency to get the current session from the token."""
+    return current_auth[0]
+
+
+async def get_current_user_async(
+    current_auth: Tuple[SessionModel, User] = Depends(get_current_auth_async),
+) -> User:
+    """Async dependency to get the current authenticated user from the active session."""
+    return current_auth[1]
@@ -1,14 +1,18 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt, ExpiredSignatureError
-import bcrypt
 from fastapi import HTTPException, status, Depends, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from app.database.base import get_db
+from app.database.replicas import fall_back_to_primary
 from app.models.session import Session as SessionModel
 from app.models.user import User
-from uuid import UUID
+from app.utilis import auth_cache
+from app.utilis.password_executor import bcrypt_check, bcrypt_hash
+from uuid import UUID, uuid4
+import hashlib
 import os
 
 # JWT settings - should be in environment variables
@@ -17,40 +21,27 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 SESSION_EXPIRE_DAYS = 7  # Session expiration in days
+# Only write `last_used_at` when the stored value is older than this, so read-only
+# requests don't each UPDATE the session row (0 = touch on every request)
+SESSION_TOUCH_INTERVAL_MINUTES = int(os.getenv("SESSION_TOUCH_INTERVAL_MINUTES", "5"))
 
 # Security scheme for token extraction
 security = HTTPBearer()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    # Truncate password to 72 bytes if necessary (bcrypt limit)
-    password_bytes = plain_password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-
-    try:
-        # Handle both string and bytes for hashed_password
-        if isinstance(hashed_password, str):
-            hashed_bytes = hashed_password.encode('utf-8')
-        else:
-            hashed_bytes = hashed_password
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
-    except Exception:
-        return False
+    """Verify a password against its hash (runs bcrypt in the calling thread)"""
+    return bcrypt_check(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password with bcrypt (max 72 bytes)"""
-    # Bcrypt has a 72-byte limit, truncate if necessary
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
+    """Hash a password with bcrypt (max 72 bytes, runs in the calling thread)"""
+    return bcrypt_hash(password)
 
-    # Generate salt and hash
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+
+def hash_token(token: str) -> bytes:
+    """SHA-256 digest of an access token, as stored in `sessions.token_hash`"""
+    return hashlib.sha256(token.encode('utf-8')).digest()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -60,7 +51,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
+    # jti keeps tokens issued in the same second unique (sessions.token_hash is unique)
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -87,17 +79,8 @@ def verify_token(token: str, token_type: str = "access") -> dict:
         )
 
 
-def get_current_session(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> SessionModel:
-    """Dependency to get the current session from the token.
-
-    Validates the JWT, loads the session, enforces expiration, and updates
-    `last_used_at`. This is the single source of truth for session validity.
-    """
-    token = credentials.credentials
-
+def user_id_from_token(token: str) -> UUID:
+    """Verify an access token and return the user id from its `sub` claim."""
     # Verify JWT token
     payload = verify_token(token, token_type="access")
     user_id_str = payload.get("sub")
@@ -110,18 +93,74 @@ def get_current_session(
 
     # Convert string to UUID
     try:
-        user_id = UUID(user_id_str)
+        return UUID(user_id_str)
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user ID format"
         )
 
-    # Get session from database using the request-scoped DB session
-    db_session = db.query(SessionModel).filter(
-        SessionModel.token == token,
-        SessionModel.user_id == user_id
-    ).first()
+
+def session_with_user_statement(token_hash: bytes):
+    """SELECT of the session for a token digest joined with its user (one round trip)."""
+    return select(SessionModel, User).outerjoin(
+        User, User.id == SessionModel.user_id
+    ).where(
+        SessionModel.token_hash == token_hash
+    )
+
+
+def touch_session_statement(session_id, now: datetime):
+    """UPDATE of a session's `last_used_at`; matches no row once the session is deleted."""
+    return update(SessionModel).where(SessionModel.id == session_id).values(last_used_at=now)
+
+
+def session_idle_time(db_session: SessionModel, now: datetime) -> timedelta:
+    """Time since the session was last used (or created)."""
+    expiration_time = db_session.last_used_at or db_session.created_at
+
+    # Convert timezone-aware datetime to naive for comparison
+    if expiration_time.tzinfo is not None:
+        expiration_time = expiration_time.replace(tzinfo=None)
+
+    return now - expiration_time
+
+
+def get_current_auth(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> Tuple[SessionModel, User]:
+    """Dependency resolving the current (session, user) pair from the token.
+
+    Validates the JWT, loads the session and its user in a single joined SELECT
+    (or from the auth cache), enforces expiration, and updates `last_used_at`
+    (at most once per `SESSION_TOUCH_INTERVAL_MINUTES`). This is the single
+    source of truth for session validity; FastAPI runs it once per request even
+    when a route depends on both `get_current_session` and `get_current_user`.
+    """
+    token = credentials.credentials
+    user_id = user_id_from_token(token)
+    # identifies whose writes open the read-your-writes window (see app/database/replicas.py)
+    db.info["user_id"] = user_id
+
+    # Get session + user from the auth cache, or from database in one round trip
+    # (a unique-index probe on the token digest) using the request-scoped DB session
+    token_hash = hash_token(token)
+    cached = auth_cache.get(db, token_hash)
+    if cached is not None:
+        db_session, user = cached
+    else:
+        row = db.execute(session_with_user_statement(token_hash)).first()
+        if row is None and fall_back_to_primary(db):
+            # a session created on another worker may not have reached the replica yet
+            row = db.execute(session_with_user_statement(token_hash)).first()
+        db_session, user = row if row is not None else (None, None)
+        if db_session is not None and user is not None:
+            auth_cache.store(token_hash, db_session, user)
+
+    # The token must belong to the user the session was issued for
+    if db_session is not None and db_session.user_id != user_id:
+        db_session = None
 
     # If there is no session, or it has been marked for deletion in this
     # SQLAlchemy Session (e.g. after logout within the same request),
@@ -134,17 +173,11 @@ def get_current_session(
 
     # Check session expiration (based on last_used_at or created_at)
     now = datetime.utcnow()
-    expiration_time = db_session.last_used_at or db_session.created_at
-
-    # Convert timezone-aware datetime to naive for comparison
-    if expiration_time.tzinfo is not None:
-        expiration_time = expiration_time.replace(tzinfo=None)
-
-    # Calculate time difference
-    time_diff = now - expiration_time
+    time_diff = session_idle_time(db_session, now)
 
     if time_diff.days >= SESSION_EXPIRE_DAYS:
         # Session expired - delete it
+        auth_cache.invalidate_token(token_hash)
         db.delete(db_session)
         db.flush()
         raise HTTPException(
@@ -152,19 +185,18 @@ def get_current_session(
             detail="Session has expired"
         )
 
-    # Update last_used_at (database will handle timezone conversion)
-    db_session.last_used_at = now
-    db.flush()
-
-    return db_session
-
-
-def get_current_user(
-    current_session: SessionModel = Depends(get_current_session),
-    db: Session = Depends(get_db),
-) -> User:
-    """Dependency to get the current authenticated user from the active session."""
-    user = db.query(User).filter(User.id == current_session.user_id).first()
+    # Update last_used_at (database will handle timezone conversion), but only
+    # once per touch interval; expiry is measured in days, so minutes of slack
+    # don't change the sliding window
+    if time_diff >= timedelta(minutes=SESSION_TOUCH_INTERVAL_MINUTES):
+        if db.execute(touch_session_statement(db_session.id, now)).rowcount == 0:
+            # a cached session deleted meanwhile (logout or expiry on another worker)
+            auth_cache.invalidate_token(token_hash)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session not found"
+            )
+        auth_cache.touch_session(token_hash, now)
 
     if not user:
         raise HTTPException(
@@ -172,4 +204,18 @@ def get_current_user(
             detail="User not found"
         )
 
-    return user
+    return db_session, user
+
+
+def get_current_session(
+    current_auth: Tuple[SessionModel, User] = Depends(get_current_auth),
+) -> SessionModel:
+    """Dependency to get the current session from the token."""
+    return current_auth[0]
+
+
+def get_current_user(
+    current_auth: Tuple[SessionModel, User] = Depends(get_current_auth),
+) -> User:
+    """Dependency to get the current authenticated user from the active session."""
+    return current_auth[1]
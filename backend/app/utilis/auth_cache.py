@@ -0,0 +1,162 @@
+"""In-process cache of authenticated sessions and their users.
+
+`get_current_session` / `get_current_user` resolve the same token on every
+request of a client. This cache keeps a snapshot of the session row and the
+user row keyed by token digest, so a hot client authenticates without touching the
+database. Entries are bounded (LRU) and expire after a short TTL, which also
+bounds staleness across workers (each uvicorn worker has its own cache).
+
+Invalidate explicitly whenever the cached rows change, passing the request's
+DB session so the entries are dropped again once the change commits:
+- `invalidate_token()` on logout / session expiry
+- `invalidate_user()` on profile or password changes
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.models.session import Session as SessionModel
+from app.models.user import User
+
+# Seconds a cached entry stays valid (0 disables the cache)
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+# Maximum number of tokens kept per worker
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire `ttl` seconds after being set."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate) -> None:
+        """Remove every entry whose value matches `predicate`."""
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(v)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_cache = TTLCache(AUTH_CACHE_MAX_SIZE, AUTH_CACHE_TTL_SECONDS)
+
+
+def _snapshot(instance) -> dict:
+    """Copy the column values of an ORM instance."""
+    return {column.key: getattr(instance, column.key) for column in instance.__table__.columns}
+
+
+def _detached(model, values: dict):
+    """Rebuild a detached instance from a snapshot; merge(load=False) attaches it without a SELECT."""
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return instance
+
+
+def get(db: Session, token_hash: bytes) -> Optional[Tuple[SessionModel, User]]:
+    """Return the cached (session, user) of a token attached to `db`, or None on a miss."""
+    entry = _cache.get(token_hash)
+    if entry is None:
+        return None
+    return (
+        db.merge(_detached(SessionModel, entry["session"]), load=False),
+        db.merge(_detached(User, entry["user"]), load=False),
+    )
+
+
+async def get_async(db: AsyncSession, token_hash: bytes) -> Optional[Tuple[SessionModel, User]]:
+    """Async counterpart of `get` for an `AsyncSession`."""
+    entry = _cache.get(token_hash)
+    if entry is None:
+        return None
+    return (
+        await db.merge(_detached(SessionModel, entry["session"]), load=False),
+        await db.merge(_detached(User, entry["user"]), load=False),
+    )
+
+
+def store(token_hash: bytes, session: SessionModel, user: User) -> None:
+    """Cache the session row of a token together with its user row."""
+    _cache.set(token_hash, {"session": _snapshot(session), "user": _snapshot(user), "user_id": user.id})
+
+
+def touch_session(token_hash: bytes, last_used_at) -> None:
+    """Record a new `last_used_at` for the cached session of a token."""
+    entry = _cache.get(token_hash)
+    if entry is None:
+        return
+    _cache.set(token_hash, {**entry, "session": {**entry["session"], "last_used_at": last_used_at}})
+
+
+def invalidate_token(token_hash: bytes, db: Optional[Session | AsyncSession] = None) -> None:
+    """Drop the cached session of a token; with `db`, again once its transaction commits."""
+    _cache.pop(token_hash)
+    if db is not None:
+        db.info.setdefault(_PENDING_INVALIDATIONS, []).append(lambda: _cache.pop(token_hash))
+
+
+def invalidate_user(user_id: UUID, db: Optional[Session | AsyncSession] = None) -> None:
+    """Drop every cached token of a user (profile/password changed); with `db`, again once it commits."""
+    _cache.pop_where(lambda entry: entry["user_id"] == user_id)
+    if db is not None:
+        db.info.setdefault(_PENDING_INVALIDATIONS, []).append(lambda: invalidate_user(user_id))
+
+
+# Until the transaction that deletes/changes a row commits, a concurrent request
+# on this worker still reads the old row and may cache it again: the write's
+# invalidations are repeated after the commit (and forgotten on rollback).
+_PENDING_INVALIDATIONS = "auth_cache_invalidations"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for invalidate in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+def clear() -> None:
+    _cache.clear()
@@ -1,6 +1,9 @@
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
 
@@ -12,9 +15,76 @@ LOGS_DIR.mkdir(exist_ok=True)
 # Log file paths
 LOG_FILE = LOGS_DIR / "app.log"
 ERROR_LOG_FILE = LOGS_DIR / "errors.log"
+ACCESS_LOG_FILE = LOGS_DIR / "access.log"
+
+# Logger of the structured access log (see app/utilis/access_log.py)
+ACCESS_LOGGER = "app.access"
+
+
+def _is_access(record: logging.LogRecord) -> bool:
+    return record.name == ACCESS_LOGGER
+
+
+def _is_not_access(record: logging.LogRecord) -> bool:
+    return record.name != ACCESS_LOGGER
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the `QueueListener` thread without ever blocking the caller.
+
+    Records are queued as they are: message formatting (and `exc_info`
+    rendering) happens on the listener thread. When the bounded queue is full
+    the record is dropped and counted instead of waiting for the disk.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # same process, no pickling: leave msg/args/exc_info to the writer thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+# Queue between the app and the writer thread, set up by `setup_logging`
+_queue_handler = None
+_listener = None
+
+
+def _stop_listener():
+    # flush what is queued before the process exits
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_queue_status() -> dict:
+    """Records waiting for the writer thread and records dropped because the queue was full."""
+    if _queue_handler is None:
+        return {"queued": 0, "capacity": 0, "dropped": 0}
+    return {
+        "queued": _queue_handler.queue.qsize(),
+        "capacity": _queue_handler.queue.maxsize,
+        "dropped": _queue_handler.dropped,
+    }
+
 
 def setup_logging():
-    """Configure logging for the application - Laravel style"""
+    """Configure logging for the application - Laravel style
+
+    The console and file handlers run on a background `QueueListener` thread;
+    the root logger only gets a `DroppingQueueHandler`, so a slow disk or log
+    rotation never blocks a request. `LOG_QUEUE_SIZE` bounds the queue.
+    """
+    global _queue_handler, _listener
     
     # Create formatters - Laravel-like format
     detailed_formatter = logging.Formatter(
@@ -31,14 +101,14 @@ def setup_logging():
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
     
-    # Remove existing handlers
+    # Remove existing handlers (and the writer thread of a previous setup)
     root_logger.handlers = []
+    _stop_listener()
     
     # Console handler (INFO and above)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(simple_formatter)
-    root_logger.addHandler(console_handler)
     
     # File handler for all logs (INFO and above) - like Laravel's app.log
     file_handler = logging.handlers.RotatingFileHandler(
@@ -49,7 +119,6 @@ def setup_logging():
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(file_handler)
     
     # Error file handler (ERROR and above only) - like Laravel's error log
     error_handler = logging.handlers.RotatingFileHandler(
@@ -60,7 +129,28 @@ def setup_logging():
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(error_handler)
+
+    # Access log file: only the app.access records, one JSON object per line
+    access_handler = logging.handlers.RotatingFileHandler(
+        ACCESS_LOG_FILE,
+        maxBytes=50 * 1024 * 1024,  # 50MB
+        backupCount=5,
+        encoding='utf-8'
+    )
+    access_handler.setLevel(logging.INFO)
+    access_handler.setFormatter(logging.Formatter('%(message)s'))
+    access_handler.addFilter(_is_access)
+    for handler in (console_handler, file_handler, error_handler):
+        handler.addFilter(_is_not_access)
+
+    # Writer thread: formats and writes records queued by the root logger's only handler
+    log_queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    _queue_handler = DroppingQueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, error_handler, access_handler, respect_handler_level=True
+    )
+    _listener.start()
     
     # Set specific loggers
     logging.getLogger("uvicorn").setLevel(logging.WARNING)  # Reduce uvicorn noise
@@ -70,6 +160,8 @@ def setup_logging():
     
     return root_logger
 
+atexit.register(_stop_listener)
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module"""
     return logging.getLogger(name)
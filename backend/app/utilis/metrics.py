@@ -0,0 +1,255 @@
+"""Prometheus metrics, kept per worker and merged at scrape time.
+
+Every worker counts its own requests in plain dicts and lists. Only the event
+loop thread (the request middleware) writes them, so updates need no lock.
+With several uvicorn workers, set `METRICS_DIR` to a directory shared by them:
+each worker writes a snapshot there every `METRICS_FLUSH_SECONDS` from a
+background thread, and `GET /metrics`, served by any worker, adds up its own
+live numbers and the other workers' snapshots. Snapshots name the server they
+belong to (the workers' parent process); a worker deletes those of other
+servers when it starts, so earlier runs never leak into the totals. Counters
+of workers that have exited are kept; gauges only count snapshots refreshed
+recently, whatever process now holds the pid.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from app.database.query_stats import QueryStats
+from app.utilis.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Directory shared by the workers for their snapshots (empty = report this worker only)
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+# Seconds between two snapshots of a worker
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# Snapshots not refreshed for this many flush intervals belong to exited workers
+_STALE_FLUSHES = 3
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label of requests that matched no route (keeps label values bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+# name: (type, help) of every exported metric
+METRICS = {
+    "http_requests_total": ("counter", "Requests handled, by route name and status."),
+    "http_request_duration_seconds": ("histogram", "Request latency, by route name and status."),
+    "http_requests_in_flight": ("gauge", "Requests being handled."),
+    "http_request_db_queries_total": ("counter", "SQL statements executed by requests, by route name."),
+    "http_request_db_seconds_total": ("counter", "Time spent in SQL statements by requests, by route name."),
+    "db_pool_size": ("gauge", "Connections kept open by the pool."),
+    "db_pool_checked_out": ("gauge", "Connections in use."),
+    "db_pool_overflow": ("gauge", "Overflow connections in use."),
+    "db_pool_checkouts_total": ("counter", "Connections checked out of the pool."),
+    "db_pool_timeouts_total": ("counter", "Checkouts that timed out waiting for a connection."),
+    "db_pool_wait_seconds_total": ("counter", "Time spent waiting for a connection."),
+    "password_executor_pending": ("gauge", "Password hashes/checks queued or running."),
+    "password_executor_max_pending": ("gauge", "Password operations allowed at once."),
+    "password_executor_rejected_total": ("counter", "Password operations rejected with 503."),
+}
+
+# Gauge collectors return {metric name: [(labels, value)]}
+GaugeCollector = Callable[[], Dict[str, List[Tuple[dict, float]]]]
+
+
+class Metrics:
+    """Request counters of this worker plus the gauges it collects at snapshot time."""
+
+    def __init__(self):
+        self.in_flight = 0
+        # (route, status) -> [non-cumulative bucket counts..., +Inf count, sum]
+        self.requests: Dict[Tuple[str, str], list] = {}
+        # route -> [queries, db seconds]
+        self.queries: Dict[str, list] = {}
+        self.collectors: List[GaugeCollector] = []
+        self._flusher_pid: Optional[int] = None
+
+    def add_collector(self, collector: GaugeCollector) -> None:
+        self.collectors.append(collector)
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+        if METRICS_DIR and self._flusher_pid != os.getpid():
+            self._start_flushing()
+
+    def request_finished(self, route: Optional[str], status: int, seconds: float, stats: QueryStats) -> None:
+        self.in_flight -= 1
+        route = route or UNMATCHED_ROUTE
+        key = (route, str(status))
+        series = self.requests.get(key)
+        if series is None:
+            series = self.requests[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+        series[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        series[-1] += seconds
+
+        queries = self.queries.get(route)
+        if queries is None:
+            queries = self.queries[route] = [0, 0.0]
+        queries[0] += stats.queries
+        queries[1] += stats.db_seconds
+
+    def snapshot(self) -> dict:
+        """This worker's numbers as JSON-able data (safe to take from another thread)."""
+        gauges: Dict[str, list] = {"http_requests_in_flight": [({}, self.in_flight)]}
+        for collector in self.collectors:
+            try:
+                for name, samples in collector().items():
+                    gauges.setdefault(name, []).extend(samples)
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {str(e)}")
+        return {
+            "pid": os.getpid(),
+            "server": os.getppid(),
+            "written_at": time.time(),
+            # dict()/list() copies are single C calls: consistent under the GIL
+            "requests": [[route, status, list(series)] for (route, status), series in dict(self.requests).items()],
+            "queries": [[route, list(values)] for route, values in dict(self.queries).items()],
+            "gauges": gauges,
+        }
+
+    def render(self) -> str:
+        """Prometheus text exposition of this worker plus the other workers' snapshots."""
+        return render(self.snapshot(), _other_snapshots())
+
+    def _start_flushing(self) -> None:
+        self._flusher_pid = os.getpid()
+        _remove_other_servers()
+        threading.Thread(target=self._flush_forever, name="metrics-flush", daemon=True).start()
+
+    def _flush_forever(self) -> None:
+        path = os.path.join(METRICS_DIR, f"worker-{os.getpid()}.json")
+        while True:
+            try:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.snapshot(), f)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"Metrics snapshot failed: {str(e)}")
+            time.sleep(METRICS_FLUSH_SECONDS)
+
+
+def _snapshot_files() -> List[Tuple[str, dict]]:
+    """(path, snapshot) of every snapshot in METRICS_DIR but this worker's."""
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return []
+    snapshots = []
+    for name in os.listdir(METRICS_DIR):
+        if not name.endswith(".json") or name == f"worker-{os.getpid()}.json":
+            continue
+        path = os.path.join(METRICS_DIR, name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshots.append((path, json.load(f)))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def _remove_other_servers() -> None:
+    """Delete the snapshots left in METRICS_DIR by earlier runs of the server."""
+    for path, snapshot in _snapshot_files():
+        if snapshot.get("server") != os.getppid():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _other_snapshots() -> List[dict]:
+    """Latest snapshots of the other workers of this server sharing METRICS_DIR."""
+    return [snapshot for path, snapshot in _snapshot_files() if snapshot.get("server") == os.getppid()]
+
+
+def _is_fresh(snapshot: dict) -> bool:
+    """Whether the worker that wrote a snapshot is still refreshing it."""
+    return time.time() - snapshot.get("written_at", 0) <= _STALE_FLUSHES * METRICS_FLUSH_SECONDS
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in sorted(labels.items())
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(own: dict, others: List[dict]) -> str:
+    """Merge worker snapshots and format them for Prometheus.
+
+    Counters and histograms are summed over every snapshot; gauges only over
+    `own` and the snapshots still being refreshed.
+    """
+    requests: Dict[Tuple[str, str], list] = {}
+    queries: Dict[str, list] = {}
+    gauges: Dict[Tuple[str, str], float] = {}
+
+    for snapshot in [own, *others]:
+        for route, status, series in snapshot["requests"]:
+            total = requests.setdefault((route, status), [0] * len(series[:-1]) + [0.0])
+            for i, value in enumerate(series):
+                total[i] += value
+        for route, values in snapshot["queries"]:
+            total = queries.setdefault(route, [0, 0.0])
+            total[0] += values[0]
+            total[1] += values[1]
+        live = snapshot is own or _is_fresh(snapshot)
+        for name, samples in snapshot["gauges"].items():
+            if not live and METRICS.get(name, ("gauge",))[0] != "counter":
+                continue
+            for labels, value in samples:
+                key = (name, _labels(labels))
+                gauges[key] = gauges.get(key, 0) + value
+
+    lines = []
+
+    def header(name: str) -> None:
+        kind, help_text = METRICS[name]
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    header("http_requests_total")
+    for (route, status), series in sorted(requests.items()):
+        lines.append(f"http_requests_total{_labels({'route': route, 'status': status})} {sum(series[:-1])}")
+
+    header("http_request_duration_seconds")
+    for (route, status), series in sorted(requests.items()):
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), series[:-1]):
+            cumulative += count
+            le = bound if bound == "+Inf" else repr(bound)
+            lines.append(f"http_request_duration_seconds_bucket{_labels({'route': route, 'status': status, 'le': le})} {cumulative}")
+        labels = _labels({"route": route, "status": status})
+        lines.append(f"http_request_duration_seconds_sum{labels} {_number(series[-1])}")
+        lines.append(f"http_request_duration_seconds_count{labels} {cumulative}")
+
+    header("http_request_db_queries_total")
+    for route, (count, seconds) in sorted(queries.items()):
+        lines.append(f"http_request_db_queries_total{_labels({'route': route})} {count}")
+    header("http_request_db_seconds_total")
+    for route, (count, seconds) in sorted(queries.items()):
+        lines.append(f"http_request_db_seconds_total{_labels({'route': route})} {_number(seconds)}")
+
+    for name in METRICS:
+        samples = sorted((labels, value) for (metric, labels), value in gauges.items() if metric == name)
+        if not samples:
+            continue
+        header(name)
+        for labels, value in samples:
+            lines.append(f"{name}{labels} {_number(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -1,12 +1,23 @@
+import base64
+import binascii
+import json
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+
 class Paginator:
-    def __init__(self, items: list, page: int, page_size: int):
+    """Page metadata for a query that was paginated in the database.
+
+    Only the rows of the requested page are loaded; `total_items` comes from a
+    separate COUNT (or is derived from the page itself when it is the last one).
+    """
+
+    def __init__(self, items: list, page: int, page_size: int, total_items: int):
         self.items = items
         self.page = page
         self.page_size = page_size
-
-    @property
-    def total_items(self):
-        return len(self.items)
+        self.total_items = total_items
 
     @property
     def total_pages(self):
@@ -34,17 +45,98 @@ class Paginator:
 
     @property
     def items_on_page(self):
-        start = (self.page - 1) * self.page_size
-        end = self.page * self.page_size
-        return self.items[start:end]
+        return self.items
 
-    def prev(self):
-        return self.__class__(self.items, self.prev_num, self.page_size)
 
-    def next(self):
-        return self.__class__(self.items, self.next_num, self.page_size)
+def paginate(query: Query, page: int, page_size: int):
+    """Paginate an ORM query with LIMIT/OFFSET and return (items, paginator).
 
+    The COUNT query is skipped when the fetched page is short, because the
+    total is then known from the offset and the number of rows returned.
+    """
+    offset = (page - 1) * page_size
+    items = query.limit(page_size).offset(offset).all()
 
-def paginate(items: list, page: int, page_size: int):
-    paginator = Paginator(items, page, page_size)
+    if len(items) < page_size and (items or offset == 0):
+        total_items = offset + len(items)
+    else:
+        total_items = query.order_by(None).count()
+
+    paginator = Paginator(items, page, page_size, total_items)
     return paginator.items_on_page, paginator
+
+
+def encode_cursor(values: list) -> str:
+    """Encode the sort key of the last row into an opaque, URL-safe cursor."""
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor produced by `encode_cursor`. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def paginate_keyset(query: Query, columns: list, after: list | None, page_size: int):
+    """Paginate an ORM query by seeking past `after` on the (unique) `columns` sort key.
+
+    Returns (items, next_cursor). Each page costs the same regardless of depth
+    because the database seeks on the index instead of skipping OFFSET rows.
+    `next_cursor` is None on the last page.
+    """
+    if after is not None:
+        query = query.filter(tuple_(*columns) > tuple_(*after))
+
+    rows = query.order_by(*columns).limit(page_size + 1).all()
+    return _keyset_page(rows, columns, page_size)
+
+
+def _keyset_page(rows: list, columns: list, page_size: int):
+    """Split the page_size + 1 fetched rows into (items, next_cursor)."""
+    items = rows[:page_size]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+
+    return items, next_cursor
+
+
+async def _fetch(db: AsyncSession, stmt: Select) -> list:
+    """Entities for a `select()` of one ORM entity, rows for a `select()` of columns (like `Query`)."""
+    result = await db.execute(stmt)
+    descriptions = stmt.column_descriptions
+    if len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]:
+        return result.scalars().all()
+    return result.all()
+
+
+async def paginate_async(db: AsyncSession, stmt: Select, page: int, page_size: int):
+    """Async counterpart of `paginate` for a 2.0-style `select()` of ORM entities or columns."""
+    offset = (page - 1) * page_size
+    items = await _fetch(db, stmt.limit(page_size).offset(offset))
+
+    if len(items) < page_size and (items or offset == 0):
+        total_items = offset + len(items)
+    else:
+        total_items = await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+    paginator = Paginator(items, page, page_size, total_items)
+    return paginator.items_on_page, paginator
+
+
+async def paginate_keyset_async(db: AsyncSession, stmt: Select, columns: list, after: list | None, page_size: int):
+    """Async counterpart of `paginate_keyset` for a 2.0-style `select()` of ORM entities or columns."""
+    if after is not None:
+        stmt = stmt.where(tuple_(*columns) > tuple_(*after))
+
+    rows = await _fetch(db, stmt.order_by(*columns).limit(page_size + 1))
+    return _keyset_page(rows, columns, page_size)
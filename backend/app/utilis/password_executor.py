@@ -0,0 +1,167 @@
+"""Bounded executor for bcrypt password work.
+
+bcrypt with 12 rounds costs ~250ms of CPU. Running it directly in the sync
+route handlers pins an AnyIO threadpool slot per login/register/password change,
+so a login burst can starve every other endpoint. Password work is instead
+submitted to a dedicated pool (processes by default, so hashes run in parallel
+across cores) and admission is capped: once `PASSWORD_MAX_PENDING` operations
+are queued or running, new ones are rejected with 503 instead of piling up
+threads.
+
+Sync routes still wait for the result on their threadpool thread (`run()`
+blocks on `.result()`); the CPU work moves off that thread, but the thread
+stays occupied, so `PASSWORD_MAX_PENDING` is what bounds how many request
+threads password work can hold. Async routes (`run_async()`) hold none.
+The app's lifespan calls `shutdown()` when the server stops; the pool is
+created again on the next use.
+
+This module does not import the database layer, so spawned worker processes
+stay light.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
+import bcrypt
+
+BCRYPT_ROUNDS = 12
+
+# process | thread | inline (inline runs in the calling thread, e.g. for debugging)
+PASSWORD_EXECUTOR = os.getenv("PASSWORD_EXECUTOR", "process")
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(os.cpu_count() or 1)))
+# Operations allowed to be queued or running at once; keeps password work from
+# occupying more than this many request threads
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", "16"))
+
+
+def _password_bytes(password: str) -> bytes:
+    # Bcrypt has a 72-byte limit, truncate if necessary
+    password_bytes = password.encode('utf-8')
+    if len(password_bytes) > 72:
+        password_bytes = password_bytes[:72]
+    return password_bytes
+
+
+def bcrypt_hash(password: str) -> str:
+    """Hash a password with bcrypt (max 72 bytes)"""
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_password_bytes(password), salt).decode('utf-8')
+
+
+def bcrypt_check(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its bcrypt hash"""
+    try:
+        # Handle both string and bytes for hashed_password
+        if isinstance(hashed_password, str):
+            hashed_bytes = hashed_password.encode('utf-8')
+        else:
+            hashed_bytes = hashed_password
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_bytes)
+    except Exception:
+        return False
+
+
+class PasswordExecutor:
+    """Runs password functions on a bounded pool and tracks its queue depth."""
+
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        # created lazily so importing the app never forks/spawns processes
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="password"
+                        )
+        return self._executor
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, please try again",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def run(self, fn, *args):
+        """Run `fn(*args)` on the pool and wait for it; 503 when the pool is saturated."""
+        self._admit()
+        try:
+            if self.kind == "inline":
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._release()
+
+    async def run_async(self, fn, *args):
+        """Like `run`, but awaits the result instead of blocking the calling thread."""
+        self._admit()
+        try:
+            if self.kind == "inline":
+                return fn(*args)
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        """Queue depth and limits, for monitoring."""
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pool (worker processes included) without waiting for queued work."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_executor = PasswordExecutor(PASSWORD_EXECUTOR, PASSWORD_WORKERS, PASSWORD_MAX_PENDING)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password on the password executor."""
+    return password_executor.run(bcrypt_hash, password)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password executor."""
+    return password_executor.run(bcrypt_check, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password executor without blocking the event loop."""
+    return await password_executor.run_async(bcrypt_hash, password)
+
+
+async def check_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password executor without blocking the event loop."""
+    return await password_executor.run_async(bcrypt_check, plain_password, hashed_password)
@@ -0,0 +1,39 @@
+import re
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+from app.models.todo import Todo
+
+# Text search configuration used by the `todos.search_vector` generated column.
+# 'simple' does no stemming, so it behaves the same for any language.
+SEARCH_CONFIG = "simple"
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def prefix_tsquery(search: str) -> str | None:
+    """Build a to_tsquery() expression matching every word of `search` as a prefix.
+
+    "buy mil" -> "buy:* & mil:*". Only word characters survive, so the result
+    never contains tsquery operators from user input. Returns None when the
+    search has no words.
+    """
+    terms = _TERM_RE.findall(search.lower())
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def todo_search(db: Session, search: str):
+    """Return (criterion, rank) for filtering todos by `search`.
+
+    On PostgreSQL this matches the GIN-indexed `search_vector` (title + description)
+    and `rank` orders the best matches first. On other databases (e.g. SQLite in
+    ad-hoc test setups) it falls back to a substring match and `rank` is None.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        expression = prefix_tsquery(search)
+        if expression is not None:
+            tsquery = func.to_tsquery(SEARCH_CONFIG, expression)
+            return Todo.search_vector.op("@@")(tsquery), func.ts_rank(Todo.search_vector, tsquery)
+
+    return or_(Todo.title.contains(search), Todo.description.contains(search)), None
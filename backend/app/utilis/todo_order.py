@@ -0,0 +1,99 @@
+"""Sparse ordering of a user's todos.
+
+Todos are sorted by `sort_key`, a gapped 64-bit integer (`ORDER_GAP` apart when
+appended or rebalanced), with `id` breaking ties. Moving a todo only rewrites
+its own key to a value between its new neighbours; when two neighbours have no
+gap left, the user's keys are respaced once with a single set-based UPDATE.
+
+The 1-based position the API calls `order` is not stored. Unfiltered list
+pages are a contiguous slice, so their positions follow from the offset (or the
+position carried in the cursor); filtered and "today" pages, and a single todo,
+are numbered with `positions_statement` / `position_statement`, which scan the
+user's whole list.
+"""
+import uuid
+from typing import Iterable, Optional
+from sqlalchemy import func, select, tuple_, update
+from app.models.todo import Todo
+
+# Distance between consecutive keys after an append or a rebalance
+ORDER_GAP = 1024
+# Range of `todos.sort_key` (BIGINT)
+SORT_KEY_MIN = -2 ** 63
+SORT_KEY_MAX = 2 ** 63 - 1
+
+
+def tail_statement(user_id: uuid.UUID):
+    """(highest sort_key, number of todos) of a user: key and position for an appended todo."""
+    return select(func.max(Todo.sort_key), func.count()).where(Todo.user_id == user_id)
+
+
+def position_statement(todo: Todo):
+    """1-based position of one todo in its user's list."""
+    return select(func.count()).where(
+        Todo.user_id == todo.user_id,
+        tuple_(Todo.sort_key, Todo.id) <= tuple_(todo.sort_key, todo.id),
+    )
+
+
+def positions_statement(user_id: uuid.UUID, ids: Iterable[uuid.UUID]):
+    """(id, position) of the given todos within their user's full list.
+
+    Postgres cannot push the id filter below the window, so this numbers every
+    todo of the user: cost grows with the list, not with the page.
+    """
+    ranked = select(
+        Todo.id,
+        func.row_number().over(order_by=(Todo.sort_key, Todo.id)).label("position"),
+    ).where(Todo.user_id == user_id).subquery()
+    return select(ranked.c.id, ranked.c.position).where(ranked.c.id.in_(list(ids)))
+
+
+def neighbours_statement(user_id: uuid.UUID, moving_id: uuid.UUID, index: int):
+    """sort_keys just before and at 0-based `index` of the list without the moving todo."""
+    return (
+        select(Todo.sort_key)
+        .where(Todo.user_id == user_id, Todo.id != moving_id)
+        .order_by(Todo.sort_key, Todo.id)
+        .offset(max(index - 1, 0))
+        .limit(2 if index > 0 else 1)
+    )
+
+
+def rebalance_statement(user_id: uuid.UUID):
+    """Respace all keys of a user ORDER_GAP apart, keeping their order (one UPDATE)."""
+    ranked = select(
+        Todo.id,
+        func.row_number().over(order_by=(Todo.sort_key, Todo.id)).label("position"),
+    ).where(Todo.user_id == user_id).subquery()
+    return (
+        update(Todo)
+        .where(Todo.id == ranked.c.id)
+        .values(sort_key=ranked.c.position * ORDER_GAP)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def key_for_index(current: int, index: int, neighbours: list, highest: Optional[int]) -> Optional[int]:
+    """Key placing a todo (now keyed `current`) at 0-based `index`.
+
+    `neighbours` are the `neighbours_statement` rows and `highest` the largest
+    key of the user (needed only when `index` is past the end). Returns
+    `current` when the todo is already there, None when the neighbours have no
+    gap left (rebalance first).
+    """
+    if index == 0:
+        if not neighbours or current < neighbours[0]:
+            return current
+        return neighbours[0] - ORDER_GAP
+    if len(neighbours) == 2:
+        before, after = neighbours
+        if before < current < after:
+            return current
+        if after - before < 2:
+            return None
+        return (before + after) // 2
+    if neighbours:
+        return current if current > neighbours[0] else neighbours[0] + ORDER_GAP
+    return current if current >= highest else highest + ORDER_GAP
+
@@ -37,3 +37,8 @@ def at_most(field: str, n: int, label: str | None = None) -> str:
 def future_date(field: str, label: str | None = None) -> str:
     name = _label(field, label)
     return f"{name} must be in the future"
+
+
+def invalid(field: str, label: str | None = None) -> str:
+    name = _label(field, label)
+    return f"{name} is invalid"
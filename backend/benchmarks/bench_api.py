@@ -0,0 +1,79 @@
+"""Benchmark: requests/sec of `GET /api/v1/todos` (50-item page) in-process.
+
+Compares the same endpoint served:
+- without a response model, returning ORM objects (the read path before the
+  list endpoints selected columns): `jsonable_encoder` + `json.dumps`
+- without a response model, returning the current column rows as dicts
+- with `response_model=TodoListResponse` (the app's routes): FastAPI validates
+  the payload and dumps it to JSON bytes in pydantic's Rust core
+
+Requests go through `TestClient` (ASGI, no network). Auth is overridden so the
+numbers show query + serialization, not the session lookup.
+
+Usage (from backend/):
+    python -m benchmarks.bench_api [--iterations 1000] [--page-size 50]
+"""
+import argparse
+from contextlib import ExitStack
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.controllers.todo_controller import TodoController
+from app.database.base import get_db, get_read_db
+from app.requests.todo.todo_index_request import TodoIndexRequest, todo_index_request
+from app.routers import web
+from app.utilis.auth import get_current_user
+from benchmarks.bench_list import orm_page
+from benchmarks.common import rollback_session, seed_user, measure, report
+
+
+def untyped_router(orm: bool) -> APIRouter:
+    router = APIRouter()
+
+    @router.get("/todos")
+    def index(request: TodoIndexRequest = Depends(todo_index_request), db: Session = Depends(get_read_db), current_user=Depends(get_current_user)):
+        if orm:
+            return orm_page(db, current_user.id, request.page_size)
+        return TodoController.index(current_user, db, request.page, request.page_size, None, None, None, None)
+
+    return router
+
+
+def client_for(router: APIRouter, db: Session, user) -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with rollback_session() as db, ExitStack() as stack:
+        user, session = seed_user(db, todos=args.page_size)
+        # entered clients keep one event loop for all their requests
+        clients = {
+            "ORM objects, jsonable_encoder": stack.enter_context(client_for(untyped_router(orm=True), db, user)),
+            "rows, jsonable_encoder": stack.enter_context(client_for(untyped_router(orm=False), db, user)),
+            "rows, TodoListResponse": stack.enter_context(client_for(web.router, db, user)),
+        }
+
+        results = {}
+        for label, client in clients.items():
+            def get():
+                db.expunge_all()
+                response = client.get("/api/v1/todos", params={"page_size": args.page_size})
+                assert response.status_code == 200 and len(response.json()["items"]) == args.page_size
+            results[label] = measure(get, args.iterations)
+
+        report("GET /api/v1/todos", results)
+        for label, stats in results.items():
+            print(f"{label:<32}{1_000_000 / stats['mean']:>12.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark: resolving the authenticated session + user.
+
+Compares the old two sequential queries (session, then user) with the single
+joined SELECT used by `get_current_auth`, and with an auth cache hit.
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth [--iterations 2000]
+"""
+import argparse
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.utilis import auth_cache
+from benchmarks.common import rollback_session, seed_user, measure, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with rollback_session() as db:
+        user, session = seed_user(db)
+        token_hash, user_id = session.token_hash, user.id
+
+        def two_queries():
+            db.expunge_all()
+            s = db.query(SessionModel).filter(SessionModel.token_hash == token_hash).first()
+            db.query(User).filter(User.id == s.user_id).first()
+
+        def joined_query():
+            db.expunge_all()
+            db.query(SessionModel, User).outerjoin(User, User.id == SessionModel.user_id).filter(
+                SessionModel.token_hash == token_hash
+            ).first()
+
+        auth_cache.store(token_hash, session, user)
+
+        def cache_hit():
+            db.expunge_all()
+            auth_cache.get(db, token_hash)
+
+        report("Session + user resolution per request", {
+            "two sequential queries": measure(two_queries, args.iterations),
+            "single joined query": measure(joined_query, args.iterations),
+            "auth cache hit": measure(cache_hit, args.iterations),
+        })
+        auth_cache.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: CPU cost of a 50-item todo list page.
+
+Compares, for `GET /todos`:
+- the former read path: `db.query(Todo)` hydrating ORM objects, serialized by
+  FastAPI's `jsonable_encoder` (which introspects every object)
+- the current one: `TodoController.index` selecting `_LIST_COLUMNS` as rows,
+  serialized through the `TodoListResponse` model
+
+The "serialization" table only turns an already fetched page into JSON; the
+"request" table also runs the query, as the endpoint does.
+
+Usage (from backend/):
+    python -m benchmarks.bench_list [--iterations 2000] [--page-size 50]
+"""
+import argparse
+import json
+from fastapi.encoders import jsonable_encoder
+from app.controllers.todo_controller import TodoController
+from app.models.todo import Todo
+from app.responses.todo.todo_list_response import TodoListResponse
+from benchmarks.common import rollback_session, seed_user, measure, report
+
+
+def orm_page(db, user_id, page_size: int) -> dict:
+    """The former index: full Todo objects with their position set as an attribute."""
+    items = db.query(Todo).filter(Todo.user_id == user_id).order_by(Todo.sort_key, Todo.id).limit(page_size).all()
+    for position, todo in enumerate(items, start=1):
+        todo.order = position
+    return {"items": items, "page": 1, "page_size": page_size, "total": len(items), "next_cursor": None}
+
+
+def orm_json(payload: dict) -> str:
+    return json.dumps(jsonable_encoder(payload))
+
+
+def model_json(payload: dict) -> str:
+    # what FastAPI does with `response_model`: validate, dump to JSON-able data, json.dumps
+    return json.dumps(TodoListResponse.model_validate(payload).model_dump(mode="json", exclude_unset=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    page_size = args.page_size
+
+    with rollback_session() as db:
+        user, session = seed_user(db, todos=page_size)
+        user_id = user.id
+
+        def lean_page():
+            return TodoController.index(user, db, 1, page_size, None, None, None, None)
+
+        orm_payload = orm_page(db, user_id, page_size)
+        lean_payload = lean_page()
+        assert json.loads(orm_json(orm_payload))["items"][0]["title"] == json.loads(model_json(lean_payload))["items"][0]["title"]
+
+        report("serialization (page already fetched)", {
+            "ORM objects + jsonable_encoder": measure(lambda: orm_json(orm_payload), args.iterations),
+            "rows + TodoListResponse": measure(lambda: model_json(lean_payload), args.iterations),
+        })
+
+        def orm_request():
+            db.expunge_all()
+            return orm_json(orm_page(db, user_id, page_size))
+
+        def lean_request():
+            db.expunge_all()
+            return model_json(lean_page())
+
+        report("request (query + serialization)", {
+            "ORM objects + jsonable_encoder": measure(orm_request, args.iterations),
+            "rows + TodoListResponse": measure(lean_request, args.iterations),
+        })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark: per-query overhead of the hot todo/auth lookups.
+
+Compares, for the todo-by-id lookup and the session + user lookup:
+- the legacy `db.query(...).filter(...)` the controllers used to build
+- the 2.0 `select()` statements now used by `TodoController` and `get_current_auth`
+- `lambda_stmt()` versions of the same statements (for reference: cheaper to build,
+  but slower to execute through the ORM, which re-resolves the lambda every call)
+- the `select()` statements on psycopg 3 with server-side prepared statements
+
+The "python overhead" table only builds each statement and computes its cache key,
+the work done before anything is sent to the database; the other tables execute it.
+
+Usage (from backend/):
+    python -m benchmarks.bench_statements [--iterations 2000]
+"""
+import argparse
+from sqlalchemy import create_engine, lambda_stmt, select
+from sqlalchemy.engine import make_url
+from app.controllers.todo_controller import _todo_statement
+from app.database.base import database_url
+from app.database.pool import pool_options
+from app.models.session import Session as SessionModel
+from app.models.todo import Todo
+from app.models.user import User
+from app.utilis.auth import session_with_user_statement
+from benchmarks.common import rollback_session, seed_user, measure, report
+
+
+def legacy_todo_query(db, user_id, todo_id):
+    return db.query(Todo).filter(Todo.id == todo_id, Todo.user_id == user_id)
+
+
+def lambda_todo_statement(user_id, todo_id):
+    return lambda_stmt(lambda: select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id))
+
+
+def legacy_auth_query(db, token_hash):
+    return db.query(SessionModel, User).outerjoin(User, User.id == SessionModel.user_id).filter(
+        SessionModel.token_hash == token_hash
+    )
+
+
+def lambda_auth_statement(token_hash):
+    return lambda_stmt(lambda: select(SessionModel, User).outerjoin(
+        User, User.id == SessionModel.user_id
+    ).where(SessionModel.token_hash == token_hash))
+
+
+def run(db, label: str, iterations: int, results: dict, legacy: bool) -> None:
+    user, session = seed_user(db, todos=20)
+    user_id, token_hash = user.id, session.token_hash
+    todo_id = db.query(Todo.id).filter(Todo.user_id == user_id).first()[0]
+
+    def timed(fn):
+        def run_once():
+            db.expunge_all()
+            return fn()
+        return measure(run_once, iterations)
+
+    todo_rows = results["todo by id round trip"]
+    auth_rows = results["session + user round trip"]
+
+    if legacy:
+        results["python overhead"]["query().filter()"] = measure(
+            lambda: legacy_todo_query(db, user_id, todo_id).statement._generate_cache_key(), iterations
+        )
+        results["python overhead"]["select()"] = measure(
+            lambda: _todo_statement(user_id, todo_id)._generate_cache_key(), iterations
+        )
+        results["python overhead"]["lambda_stmt()"] = measure(
+            lambda: lambda_todo_statement(user_id, todo_id)._generate_cache_key(), iterations
+        )
+        todo_rows[f"query(), {label}"] = timed(lambda: legacy_todo_query(db, user_id, todo_id).first())
+        auth_rows[f"query(), {label}"] = timed(lambda: legacy_auth_query(db, token_hash).first())
+
+    todo_rows[f"select(), {label}"] = timed(lambda: db.scalars(_todo_statement(user_id, todo_id)).first())
+    auth_rows[f"select(), {label}"] = timed(lambda: db.execute(session_with_user_statement(token_hash)).first())
+
+    if legacy:
+        todo_rows[f"lambda_stmt(), {label}"] = timed(lambda: db.scalars(lambda_todo_statement(user_id, todo_id)).first())
+        auth_rows[f"lambda_stmt(), {label}"] = timed(lambda: db.execute(lambda_auth_statement(token_hash)).first())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {"python overhead": {}, "todo by id round trip": {}, "session + user round trip": {}}
+
+    with rollback_session() as db:
+        run(db, make_url(database_url).get_driver_name(), args.iterations, results, legacy=True)
+
+    # same statements with server-side prepared statements (psycopg 3)
+    prepared_url = make_url(database_url).set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+    prepared_engine = create_engine(prepared_url, **pool_options(prepared_url))
+    try:
+        with rollback_session(prepared_engine) as db:
+            run(db, "psycopg prepared", args.iterations, results, legacy=False)
+    finally:
+        prepared_engine.dispose()
+
+    for title, rows in results.items():
+        report(f"{title} (per query)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Shared helpers for the micro-benchmarks in this folder.
+
+Benchmarks run against the database configured in `.env` (same as the app),
+inside a transaction that is rolled back at the end, so they never leave data
+behind.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable, Generator
+from uuid import uuid4
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.database.base import engine, SessionLocal
+from app.database.faker import make_user, make_session, make_todo
+from app.utilis.todo_order import ORDER_GAP
+
+
+@contextmanager
+def rollback_session(bind: Engine = None) -> Generator[Session, None, None]:
+    """Yield a Session bound to a transaction that is always rolled back (app engine by default)."""
+    connection = (bind or engine).connect()
+    transaction = connection.begin()
+    session = SessionLocal(bind=connection)
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+def seed_user(db: Session, todos: int = 0):
+    """Create a user with a session and `todos` todos; return (user, session)."""
+    user = make_user()
+    db.add(user)
+    db.flush()
+    session = make_session(user_id=user.id)
+    db.add(session)
+    db.add_all(make_todo(user_id=user.id, sort_key=i * ORDER_GAP, title=f"bench todo {i} {uuid4().hex[:6]}") for i in range(1, todos + 1))
+    db.flush()
+    return user, session
+
+
+def measure(fn: Callable[[], object], iterations: int = 1000, warmup: int = 50) -> dict:
+    """Run `fn` repeatedly and return timing stats in microseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    samples.sort()
+    return {
+        "mean": statistics.fmean(samples),
+        "p50": samples[len(samples) // 2],
+        "p99": samples[int(len(samples) * 0.99) - 1],
+    }
+
+
+def report(title: str, results: dict) -> None:
+    """Print a small table of {label: stats} and the speedup vs the first row."""
+    print(f"\n{title}")
+    print(f"{'variant':<32}{'mean µs':>12}{'p50 µs':>12}{'p99 µs':>12}{'speedup':>10}")
+    baseline = None
+    for label, stats in results.items():
+        baseline = baseline or stats["mean"]
+        print(f"{label:<32}{stats['mean']:>12.1f}{stats['p50']:>12.1f}{stats['p99']:>12.1f}{baseline / stats['mean']:>9.2f}x")